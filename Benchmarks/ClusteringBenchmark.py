@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from SyntheticData import generate_payloads
+from MissionDataExtractor import MissionDataExtractor
+from MissionEmbeddings import EMBEDDING_BACKENDS, create_backend
+from SnapshotStore import SnapshotStore
+
+# What each backend needs imported before it can fit, timed in a fresh interpreter
+BACKEND_IMPORTS = {
+    'word2vec': 'import gensim.models, sklearn.cluster, sklearn.decomposition',
+    'tfidf': 'import sklearn.cluster, sklearn.feature_extraction.text',
+}
+
+def measure_import(backend_name):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', BACKEND_IMPORTS[backend_name]], check=True)
+    return time.perf_counter() - start
+
+def load_mission_names(args):
+    """
+    Returns the mission names the app clusters, from the local snapshot when there is one.
+    """
+    store = SnapshotStore(args.snapshot)
+    if store.exists() and not args.synthetic:
+        missions_df, _ = MissionDataExtractor().load_snapshot(store)
+        return missions_df['Mission'].unique().tolist(), 'snapshot'
+
+    # Without a snapshot, fall back to the mission names of the fake potato.tf payloads
+    _, _, mission_infos = generate_payloads(maps=args.maps, missions_per_map=args.missions_per_map, records_per_map=0)
+    names = [info['name'].replace('_', ' ') for infos in mission_infos.values() for info in infos]
+    return list(dict.fromkeys(names)), 'synthetic'
+
+def measure(backend_name, mission_names, n_clusters, repeats):
+    wall_times = []
+    runs = []
+    for _ in range(repeats):
+        backend = create_backend(backend_name)
+        start = time.perf_counter()
+        runs.append(backend.fit_predict(mission_names, n_clusters))
+        wall_times.append(time.perf_counter() - start)
+
+    # Peak memory gets its own run, tracing every allocation would distort the timings above
+    tracemalloc.start()
+    create_backend(backend_name).fit_predict(mission_names, n_clusters)
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # How much a backend agrees with itself from one fit to the next, the ceiling for cross-backend agreement
+    stability = [adjusted_rand_score(previous, current) for previous, current in zip(runs, runs[1:])]
+    return runs[-1], {
+        'backend': backend_name,
+        'import_s': round(measure_import(backend_name), 3),
+        'fit_s': round(float(np.median(wall_times)), 4),
+        'peak_kib': round(peak_bytes / 1024, 1),
+        'clusters_used': int(len(set(runs[-1]))),
+        'ari_run_to_run': round(float(np.mean(stability)), 3) if stability else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the mission clustering backends on time, peak memory and agreement.')
+    parser.add_argument('--snapshot', default='Snapshot', help='Snapshot directory to read the mission list from')
+    parser.add_argument('--synthetic', action='store_true', help='Use synthetic mission names even when a snapshot exists')
+    parser.add_argument('--maps', type=int, default=80)
+    parser.add_argument('--missions-per-map', type=int, default=6)
+    parser.add_argument('--clusters', type=int, default=30)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON instead of a table')
+    args = parser.parse_args()
+
+    mission_names, source = load_mission_names(args)
+    n_clusters = min(args.clusters, len(mission_names))
+    labels = {}
+    results = []
+    for backend_name in EMBEDDING_BACKENDS:
+        labels[backend_name], result = measure(backend_name, mission_names, n_clusters, args.repeats)
+        results.append(result)
+
+    # Agreement of every backend with the Word2Vec clustering the app used so far
+    reference = labels['word2vec']
+    for result in results:
+        result['ari_vs_word2vec'] = round(adjusted_rand_score(reference, labels[result['backend']]), 3)
+        result['nmi_vs_word2vec'] = round(normalized_mutual_info_score(reference, labels[result['backend']]), 3)
+
+    if args.json:
+        print(json.dumps({'source': source, 'missions': len(mission_names), 'clusters': n_clusters, 'results': results}, indent=2))
+        return
+
+    print(f'{len(mission_names)} {source} missions, {n_clusters} clusters')
+    columns = list(results[0].keys())
+    print(' '.join(f'{column:>16}' for column in columns))
+    for result in results:
+        print(' '.join(f'{str(result[column]):>16}' for column in columns))
+
+if __name__ == '__main__':
+    main()
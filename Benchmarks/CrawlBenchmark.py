@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from FakePotatoServer import FakePotatoServer
+from MissionDataExtractor import MissionDataExtractor
+
+class TimedExtractor(MissionDataExtractor):
+    """
+    A MissionDataExtractor that records how long each map took, from task start to processed frames.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.map_latencies = []
+
+    async def fetch_map_data(self, session, map_info_item, pool=None):
+        start = time.perf_counter()
+        result = await super().fetch_map_data(session, map_info_item, pool)
+        self.map_latencies.append(time.perf_counter() - start)
+        return result
+
+async def measure(concurrency, args):
+    server = FakePotatoServer(latency=args.latency, max_concurrent=args.server_limit, failure_rate=args.failure_rate,
+                              maps=args.maps, records_per_map=args.records_per_map)
+    base_url = await server.start()
+    try:
+        extractor = TimedExtractor(base_url=base_url, max_requests_per_host=concurrency, backoff_base=args.backoff_base)
+        start = time.perf_counter()
+        missions_df, _ = await extractor.collect(extractor.run())
+        wall_time = time.perf_counter() - start
+    finally:
+        await server.stop()
+
+    latencies = np.array(extractor.map_latencies)
+    return {
+        'concurrency': concurrency,
+        'wall_s': round(wall_time, 3),
+        'maps_ok': int(missions_df['Map'].nunique()) if missions_df is not None and not missions_df.empty else 0,
+        'requests': server.stats['requests'],
+        'rate_limited': server.stats['rate_limited'],
+        'requests_per_s': round(server.stats['requests'] / wall_time, 1),
+        'map_p50_s': round(float(np.percentile(latencies, 50)), 3),
+        'map_p95_s': round(float(np.percentile(latencies, 95)), 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure crawl throughput and per-map latency against a local fake potato.tf.')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--maps', type=int, default=40)
+    parser.add_argument('--records-per-map', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--server-limit', type=int, default=12, help='Concurrent requests the fake server accepts before answering 429')
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--backoff-base', type=float, default=0.1)
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON instead of a table')
+    args = parser.parse_args()
+
+    results = [asyncio.run(measure(concurrency, args)) for concurrency in args.concurrency]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    columns = list(results[0].keys())
+    print(' '.join(f'{column:>14}' for column in columns))
+    for result in results:
+        print(' '.join(f'{result[column]:>14}' for column in columns))
+
+if __name__ == '__main__':
+    main()
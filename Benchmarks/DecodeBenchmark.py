@@ -0,0 +1,82 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from SyntheticData import generate_payloads
+from MissionDataExtractor import MissionDataExtractor
+from SpeedrunDecoder import msgspec
+
+# Fields of a Steam player summary that potato.tf passes through and the app never reads
+UNUSED_PLAYER_FIELDS = {
+    'communityvisibilitystate': 3,
+    'profilestate': 1,
+    'avatar': 'https://avatars.steamstatic.com/0000000000000000000000000000000000000000.jpg',
+    'avatarfull': 'https://avatars.steamstatic.com/0000000000000000000000000000000000000000_full.jpg',
+    'avatarhash': '0000000000000000000000000000000000000000',
+    'lastlogoff': 1700000000,
+    'personastate': 0,
+    'primaryclanid': '103582791429521408',
+    'timecreated': 1300000000,
+    'personastateflags': 0,
+    'loccountrycode': 'US',
+}
+
+def build_body(records, players, extra_fields):
+    """
+    Returns one /api/speedrun body of records records, its players carrying Steam's unused fields when extra_fields is set.
+    """
+    _, speedruns, _ = generate_payloads(maps=1, records_per_map=records, players=players)
+    speedrun_data = next(iter(speedruns.values()))
+    if extra_fields:
+        speedrun_data = [dict(record, players=[dict(player, **UNUSED_PLAYER_FIELDS) for player in record['players']])
+                         for record in speedrun_data]
+    return json.dumps(speedrun_data).encode()
+
+def generic_columns(extractor, body):
+    # The path every payload took before, and still takes without msgspec
+    return extractor.build_record_columns(json.loads(body))
+
+def measure(function, body, repeat):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function(body)
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    result = function(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare decoding /api/speedrun bodies into columns with json.loads and with msgspec structs.')
+    parser.add_argument('--records', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--players', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-extra-fields', action='store_true', help="Leave out the Steam fields potato.tf sends but the app ignores")
+    args = parser.parse_args()
+    if msgspec is None:
+        print('msgspec is not installed, only the generic path can be measured.')
+
+    extractor = MissionDataExtractor()
+    print(f"{'records':>8} {'body_mib':>9} {'path':>8} {'time_ms':>9} {'peak_mib':>9} {'same':>5}")
+    for records in args.records:
+        body = build_body(records, args.players, not args.no_extra_fields)
+        paths = [('json', lambda body: generic_columns(extractor, body))]
+        if msgspec is not None:
+            paths.append(('msgspec', extractor.decode_record_columns))
+        baseline = None
+        for label, function in paths:
+            elapsed, peak, columns = measure(function, body, args.repeat)
+            baseline = baseline or columns
+            print(f'{records:>8} {len(body) / 2**20:>9.1f} {label:>8} {elapsed * 1000:>9.1f} {peak / 2**20:>9.1f} {str(columns == baseline):>5}')
+
+if __name__ == '__main__':
+    main()
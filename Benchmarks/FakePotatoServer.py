@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from aiohttp import web
+from SyntheticData import generate_payloads
+
+class FakePotatoServer:
+    """
+    A local stand-in for the potato.tf API used to measure the crawler offline.
+
+    Every response is delayed by a configurable latency, requests above the concurrency limit are answered with
+    429 and a Retry-After header, and a share of requests can fail with 503 to exercise the retry path.
+
+    Attributes:
+        latency (float, optional): The mean delay added to every response in seconds (default is 0.1).
+        latency_jitter (float, optional): The +/- spread applied to the latency (default is 0.05).
+        max_concurrent (int, optional): The number of requests served at once before answering 429 (default is None, unlimited).
+        retry_after (int, optional): The Retry-After value sent with a 429 (default is 1).
+        failure_rate (float, optional): The share of requests answered with 503 (default is 0).
+        conditional (bool, optional): Whether responses carry an ETag and honour If-None-Match with 304 (default is True).
+    """
+    def __init__(self, latency=0.1, latency_jitter=0.05, max_concurrent=None, retry_after=1, failure_rate=0.0, conditional=True, seed=0, **payload_options):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.failure_rate = failure_rate
+        self.conditional = conditional
+        self.rng = random.Random(seed)
+        self.map_info, self.speedruns, self.mission_infos = generate_payloads(seed=seed, **payload_options)
+        self.in_flight = 0
+        self.stats = {'requests': 0, 'rate_limited': 0, 'failed': 0, 'bytes': 0}
+        self.runner = None
+
+    @web.middleware
+    async def simulate_network(self, request, handler):
+        self.stats['requests'] += 1
+        if self.max_concurrent is not None and self.in_flight >= self.max_concurrent:
+            self.stats['rate_limited'] += 1
+            return web.Response(status=429, headers={'Retry-After': str(self.retry_after)})
+
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.latency_jitter, self.latency_jitter)))
+            if self.rng.random() < self.failure_rate:
+                self.stats['failed'] += 1
+                return web.Response(status=503)
+            response = await handler(request)
+            self.stats['bytes'] += len(response.body or b'')
+            return response
+        finally:
+            self.in_flight -= 1
+
+    def json_response(self, request, payload):
+        body = json.dumps(payload).encode()
+        if not self.conditional:
+            return web.Response(body=body, content_type='application/json')
+
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=body, content_type='application/json', headers={'ETag': etag})
+
+    async def handle_map_info(self, request):
+        return self.json_response(request, self.map_info)
+
+    async def handle_speedrun(self, request):
+        return self.json_response(request, self.speedruns.get(request.query.get('map'), []))
+
+    async def handle_mission_info(self, request):
+        return self.json_response(request, self.mission_infos.get(request.query.get('map'), []))
+
+    def add_runs(self, maps_changed, runs_per_map=1):
+        """
+        Appends new runs to the first maps_changed maps, as if they were submitted since the last crawl.
+        """
+        for item in self.map_info[:maps_changed]:
+            records = self.speedruns[item['name']]
+            latest = max(record['timeAdded'] for record in records) if records else 1577836800
+            for offset in range(1, runs_per_map + 1):
+                template = self.rng.choice(records)
+                records.append(dict(template, time=self.rng.randint(600, 7200), timeAdded=latest + offset))
+
+    def create_app(self):
+        app = web.Application(middlewares=[self.simulate_network])
+        app.router.add_get('/api/mapinfo', self.handle_map_info)
+        app.router.add_get('/api/speedrun', self.handle_speedrun)
+        app.router.add_get('/api/missioninfo', self.handle_mission_info)
+        return app
+
+    async def start(self, host='127.0.0.1', port=0):
+        """
+        Starts serving in the running event loop and returns the base URL to hand to MissionDataExtractor.
+        """
+        self.runner = web.AppRunner(self.create_app())
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        return f'http://{host}:{bound_port}'
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve a fake potato.tf API on localhost.')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--maps', type=int, default=40)
+    parser.add_argument('--records-per-map', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--max-concurrent', type=int, default=None)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakePotatoServer(latency=args.latency, max_concurrent=args.max_concurrent, failure_rate=args.failure_rate,
+                              maps=args.maps, records_per_map=args.records_per_map)
+    web.run_app(server.create_app(), host='127.0.0.1', port=args.port)
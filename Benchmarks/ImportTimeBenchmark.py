@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_PACKAGES = ['gensim', 'nltk', 'sklearn', 'scipy']
+
+# Clusters a mission list with the clusterer cache already written, then reports which heavy packages got loaded
+CACHED_CLUSTERING_SCRIPT = '''
+import json, sys
+from MissionClusterer import MissionClusterer
+clusterer = MissionClusterer(json.loads(sys.argv[1]), cache_dir=sys.argv[2])
+clusterer.cluster_missions()
+print(json.dumps(sorted(name for name in {heavy} if name in sys.modules)))
+'''
+
+def parse_importtime(stderr):
+    """
+    Returns a list of (self_us, cumulative_us, module) from the -X importtime report.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((int(self_us), int(cumulative_us), module.strip()))
+    return rows
+
+def measure_import(module, top):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import json, sys, {module}; print(json.dumps(sorted(sys.modules)))'],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    rows = parse_importtime(result.stderr)
+    loaded = set(json.loads(result.stdout.strip().splitlines()[-1]))
+    total_us = next(cumulative_us for _, cumulative_us, name in reversed(rows) if name == module)
+    heaviest = sorted(rows, key=lambda row: row[0], reverse=True)[:top]
+    return {
+        'module': module,
+        'import_ms': round(total_us / 1000, 1),
+        'modules_loaded': len(loaded),
+        'heavy_loaded': [name for name in HEAVY_PACKAGES if name in loaded],
+        'heaviest_self_ms': [(name, round(self_us / 1000, 1)) for self_us, _, name in heaviest],
+    }
+
+def measure_cached_clustering():
+    rng = random.Random(0)
+    words = ['broken', 'parts', 'mechanical', 'magic', 'empire', 'cave', 'desert', 'storm', 'iron', 'doom', 'toxic', 'frost']
+    mission_names = list(dict.fromkeys(f'{rng.choice(words)} {rng.choice(words)} {rng.choice(words)}' for _ in range(200)))
+    script = CACHED_CLUSTERING_SCRIPT.format(heavy=HEAVY_PACKAGES)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        runs = [subprocess.run([sys.executable, '-c', script, json.dumps(mission_names), cache_dir],
+                               cwd=ROOT_DIR, capture_output=True, text=True, check=True) for _ in range(2)]
+    return {
+        'cold_heavy_loaded': json.loads(runs[0].stdout.strip().splitlines()[-1]),
+        'cached_heavy_loaded': json.loads(runs[1].stdout.strip().splitlines()[-1]),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Report cold-start import time of the app modules with -X importtime.')
+    parser.add_argument('--modules', nargs='+', default=['ShroomerShillStation', 'MissionClusterer', 'MissionDataExtractor', 'ProfileScraper'])
+    parser.add_argument('--top', type=int, default=5, help='How many of the slowest individual imports to list')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON instead of a report')
+    args = parser.parse_args()
+
+    results = {'imports': [measure_import(module, args.top) for module in args.modules], 'clustering': measure_cached_clustering()}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results['imports']:
+        heavy = ', '.join(result['heavy_loaded']) or 'none'
+        print(f"{result['module']}: {result['import_ms']} ms, {result['modules_loaded']} modules, heavy packages: {heavy}")
+        for name, self_ms in result['heaviest_self_ms']:
+            print(f'    {self_ms:>8} ms  {name}')
+    print(f"Clustering without a cache loads: {', '.join(results['clustering']['cold_heavy_loaded']) or 'none'}")
+    print(f"Clustering from cached assignments loads: {', '.join(results['clustering']['cached_heavy_loaded']) or 'none'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import time
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from FakePotatoServer import FakePotatoServer
+from MissionDataExtractor import MissionDataExtractor, OFFLOAD_MODES
+
+def serve(port, args):
+    """
+    Runs the fake API in its own process, so its JSON encoding never competes with the crawl's event loop.
+    """
+    server = FakePotatoServer(latency=args.latency, latency_jitter=args.latency_jitter, maps=args.maps, records_per_map=args.records_per_map)
+    web.run_app(server.create_app(), host='127.0.0.1', port=port, print=None)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'The fake server did not start on port {port}')
+
+async def crawl(base_url, offload, workers):
+    extractor = MissionDataExtractor(base_url=base_url, offload=offload, offload_workers=workers)
+    start = time.perf_counter()
+    missions_df, _ = await extractor.collect(extractor.run())
+    return time.perf_counter() - start, len(missions_df)
+
+async def download_only(base_url):
+    # The crawl with no processing at all, the wall time an ideal overlap would get down to
+    extractor = MissionDataExtractor(base_url=base_url)
+    start = time.perf_counter()
+    async with extractor.create_session() as session:
+        map_info = await extractor.fetch_map_info(session)
+        await asyncio.gather(*[extractor.fetch_map_records(session, item) for item in map_info])
+    return time.perf_counter() - start, 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare crawl wall time with process_data run inline, on a thread pool or on a process pool.')
+    parser.add_argument('--modes', nargs='+', choices=OFFLOAD_MODES, default=list(OFFLOAD_MODES))
+    parser.add_argument('--workers', type=int, help='Offload pool size (default is the executor default)')
+    parser.add_argument('--maps', type=int, default=40)
+    parser.add_argument('--records-per-map', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--latency-jitter', type=float, default=0.1)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    port = free_port()
+    server_process = multiprocessing.Process(target=serve, args=(port, args), daemon=True)
+    server_process.start()
+    try:
+        wait_for_port(port)
+        base_url = f'http://127.0.0.1:{port}'
+        runs = [('download only', lambda: download_only(base_url))]
+        runs += [(mode, lambda mode=mode: crawl(base_url, mode, args.workers)) for mode in args.modes]
+        print(f"{'mode':>14} {'min_s':>8} {'median_s':>9} {'records':>8}")
+        for label, run in runs:
+            results = [asyncio.run(run()) for _ in range(args.repeats)]
+            wall_times = [wall_time for wall_time, _ in results]
+            print(f'{label:>14} {min(wall_times):>8.3f} {statistics.median(wall_times):>9.3f} {results[0][1]:>8}')
+    finally:
+        server_process.terminate()
+        server_process.join()
+
+if __name__ == '__main__':
+    main()
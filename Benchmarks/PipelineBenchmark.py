@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from SyntheticData import generate_payloads
+from MissionClusterer import MissionClusterer
+from MissionDataExtractor import MissionDataExtractor
+from MissionTitleUpdater import MissionTitleUpdater
+from PlayerCards import render_card, render_page
+from PlayerRecordIndex import PlayerRecordIndex
+from ProfileParser import DEFAULT_BACKGROUND_URL
+from FuzzySearchIndex import build_search_indexes
+from LeaderboardAggregates import LeaderboardAggregates
+from SharedDataset import SharedDataset
+
+SEARCH_QUERIES = 20  # Players looked up, and date searches run, per timing
+PROFILE = ('<p>' + 'A synthetic profile summary. ' * 20 + '</p>', DEFAULT_BACKGROUND_URL)
+
+def time_stage(function, repeats):
+    """
+    Runs function repeats times and returns its timings along with the result of the last run.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return {'min_s': round(min(timings), 5), 'median_s': round(float(np.median(timings)), 5)}, result
+
+def process_maps(extractor, speedruns):
+    frames = [extractor.process_data(records, None, map_name) for map_name, records in speedruns.items()]
+    return [missions_df for missions_df, _ in frames], [players_df for _, players_df in frames]
+
+def cluster(mission_names, n_clusters, backend):
+    clusterer = MissionClusterer(mission_names, n_clusters=n_clusters, backend=backend)
+    clusterer.cluster_missions()
+    return clusterer
+
+def search_players(player_index, steam_ids, search_dates):
+    for steam_id, search_date in zip(steam_ids, search_dates):
+        # What search_and_display_by_date does on submit, minus Streamlit
+        date_index = player_index.date_index(steam_id)
+        nearest_date = date_index.nearest_date('all', search_date)
+        if nearest_date is not None:
+            for _, row in date_index.records_on('all', nearest_date).iterrows():
+                MissionTitleUpdater.generate_prompt_for_self(row, player_index.dataset.player_names(row.name))
+
+def build_cards(players_df, data_version):
+    render_card.cache_clear()
+    cards_html = [
+        render_card(data_version, steam_id, rank, persona_name, avatar_url, int(world_records_held), *PROFILE)
+        for rank, (steam_id, persona_name, avatar_url, world_records_held) in enumerate(
+            zip(players_df['SteamID'], players_df['PersonaName'], players_df['AvatarURL'], players_df['WorldRecordsHeld']), start=1)
+    ]
+    return render_page(cards_html)
+
+def measure_scale(records, args):
+    records_per_map = max(1, records // args.maps)
+    _, speedruns, _ = generate_payloads(maps=args.maps, missions_per_map=args.missions_per_map, records_per_map=records_per_map,
+                                        players=args.players, seed=args.seed)
+    extractor = MissionDataExtractor()
+    stages = {}
+
+    stages['process_data'], (mission_frames, player_frames) = time_stage(lambda: process_maps(extractor, speedruns), args.repeats)
+    stages['post_process_dataframe'], (missions_df, players_df) = time_stage(
+        lambda: extractor.combine_frames([frame.copy() for frame in mission_frames], [frame.copy() for frame in player_frames]), args.repeats)
+
+    mission_names = missions_df['Mission'].unique().tolist()
+    n_clusters = min(30, len(mission_names))
+    stages['cluster_missions'], clusterer = time_stage(lambda: cluster(mission_names, n_clusters, args.backend), args.repeats)
+
+    title_updater = MissionTitleUpdater(clusterer)
+    stages['add_title_column'], missions_df = time_stage(lambda: title_updater.add_title_column(missions_df.copy()), args.repeats)
+
+    stages['shared_dataset'], dataset = time_stage(lambda: SharedDataset(missions_df, players_df), args.repeats)
+    stages['player_index_build'], player_index = time_stage(lambda: PlayerRecordIndex(dataset), args.repeats)
+    stages['leaderboard_aggregates'], aggregates = time_stage(lambda: LeaderboardAggregates(dataset), args.repeats)
+    stages['search_index_build'], search_indexes = time_stage(lambda: build_search_indexes(dataset, aggregates), args.repeats)
+    rng = np.random.default_rng(args.seed)
+    steam_ids = rng.choice(players_df['SteamID'].to_numpy(), SEARCH_QUERIES)
+    # Names as they are being typed: cut short, with one letter dropped
+    typed_names = [name[:1] + name[2:max(len(name) - 2, 3)] for name in rng.choice(players_df['PersonaName'].to_numpy(), SEARCH_QUERIES)]
+    stages['fuzzy_search'], _ = time_stage(lambda: [search_indexes['player'].search(name) for name in typed_names], args.repeats)
+    stages['player_lookup'], _ = time_stage(lambda: [player_index.records_for_player(steam_id) for steam_id in steam_ids], args.repeats)
+
+    search_dates = pd.to_datetime(rng.integers(1577836800, 1735689600, SEARCH_QUERIES), unit='s').normalize()
+    # A fresh index for every repeat so that the per-player date indexes are built inside the timing
+    stages['date_search'], _ = time_stage(lambda: search_players(PlayerRecordIndex(dataset), steam_ids, search_dates), args.repeats)
+
+    top_players_df = dataset.players_df.nlargest(args.cards, 'WorldRecordsHeld')
+    stages['display_cards_html'], page_html = time_stage(lambda: build_cards(top_players_df, 0), args.repeats)
+
+    return {
+        'records': len(missions_df),
+        'players': len(players_df),
+        'missions': len(mission_names),
+        'cards_html_kib': round(len(page_html) / 1024, 1),
+        'stages': stages,
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def apply_thresholds(results, baseline, tolerance, slack):
+    """
+    Marks every stage slower than its baseline median by more than the tolerance (and the absolute slack) as regressed.
+    Returns the number of regressions.
+    """
+    baseline_medians = {(scale['records'], stage): timing['median_s']
+                        for scale in baseline['scales'] for stage, timing in scale['stages'].items()}
+    regressions = 0
+    for scale in results['scales']:
+        for stage, timing in scale['stages'].items():
+            baseline_median = baseline_medians.get((scale['records'], stage))
+            if baseline_median is None:
+                continue
+            timing['baseline_median_s'] = baseline_median
+            timing['threshold_s'] = round(max(baseline_median * tolerance, baseline_median + slack), 5)
+            timing['regressed'] = timing['median_s'] > timing['threshold_s']
+            regressions += timing['regressed']
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Time every stage of the data pipeline on synthetic potato.tf payloads of increasing size.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[2000, 10000, 50000], help='Total records per run')
+    parser.add_argument('--maps', type=int, default=40)
+    parser.add_argument('--missions-per-map', type=int, default=6)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--cards', type=int, default=50, help='Player cards built for the dashboard stage')
+    parser.add_argument('--backend', default='tfidf', help='Mission clustering backend')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help='A previous JSON result to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='Allowed slowdown factor over the baseline median')
+    parser.add_argument('--slack', type=float, default=0.005, help='Allowed absolute slowdown in seconds, for stages that take milliseconds')
+    parser.add_argument('--output', help='Write the JSON result to this file as well as printing it')
+    args = parser.parse_args()
+
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'parameters': {key: value for key, value in vars(args).items() if key not in ('baseline', 'output')},
+        'scales': [measure_scale(records, args) for records in args.scales],
+    }
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = apply_thresholds(results, json.load(f), args.tolerance, args.slack)
+        results['regressions'] = regressions
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
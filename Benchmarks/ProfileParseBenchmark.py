@@ -0,0 +1,81 @@
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ProfileParser import extract_profile, DEFAULT_BACKGROUND_URL
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'profiles')
+
+# The BeautifulSoup extraction the app used before ProfileParser, kept here as the baseline
+def legacy_parse_description(description_tag):
+    components = []
+    for element in description_tag.descendants:
+        if isinstance(element, NavigableString):
+            if element.strip() != '':
+                components.append(element.strip())
+        elif isinstance(element, Tag):
+            if element.name == 'br':
+                components.append('<br>')
+            elif element.name == 'img':
+                components.append(f'<img src="{element.get("src")}" alt="{element.get("alt", "")}" style="display: inline; height: auto; max-width: 100%;">')
+            elif element.name == 'a':
+                components.append(f'<a href="{element.get("href")}">{element.text}</a>')
+    return ''.join(components)
+
+def legacy_description(html):
+    soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('div', class_='profile_summary'))
+    description_tag = soup.find()
+    return legacy_parse_description(description_tag) if description_tag else '<p>No description found</p>'
+
+def legacy_background(html):
+    soup = BeautifulSoup(html, 'lxml')
+    background_div = soup.find('div', class_='profile_animated_background')
+    if not background_div:
+        background_div = soup.find('div', class_='no_header profile_page has_profile_background')
+    if not background_div:
+        background_div = soup.find('div', class_='no_header profile_page has_profile_background full_width_background')
+    if not background_div:
+        return DEFAULT_BACKGROUND_URL
+    video_tag = background_div.find('video', poster=True)
+    style = background_div.get('style', '')
+    if video_tag and 'poster' in video_tag.attrs:
+        return video_tag['poster'].replace("'", "")
+    elif 'url(' in style:
+        return style.split('url(')[1].split(')')[0].replace("'", "").replace("\"", "")
+    return ''
+
+def legacy_two_pass(html):
+    return legacy_description(html), legacy_background(html)
+
+def measure(function, html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(html)
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    function(html)
+    peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return elapsed_ms, peak_kib
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the streaming profile extractor with the BeautifulSoup baseline on saved pages.')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'fixture':>22} {'KiB':>6} {'bs4 ms':>8} {'stream ms':>10} {'speedup':>8} {'bs4 peak KiB':>13} {'stream peak KiB':>16} {'same output':>12}")
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            html = f.read()
+        legacy_ms, legacy_peak = measure(legacy_two_pass, html, args.repeat)
+        stream_ms, stream_peak = measure(extract_profile, html, args.repeat)
+        same = legacy_two_pass(html) == extract_profile(html)
+        print(f"{os.path.basename(path)[:-5]:>22} {len(html) / 1024:>6.0f} {legacy_ms:>8.2f} {stream_ms:>10.2f} {legacy_ms / stream_ms:>7.1f}x {legacy_peak:>13.0f} {stream_peak:>16.0f} {str(same):>12}")
+
+if __name__ == '__main__':
+    main()
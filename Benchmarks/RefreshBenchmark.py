@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from FakePotatoServer import FakePotatoServer
+from MissionDataExtractor import MissionDataExtractor
+from SnapshotStore import SnapshotStore
+
+async def timed_refresh(extractor, store, server):
+    requests_before, bytes_before = server.stats['requests'], server.stats['bytes']
+    start = time.perf_counter()
+    missions_df, _ = await extractor.collect(extractor.refresh(store))
+    return {
+        'wall_s': round(time.perf_counter() - start, 3),
+        'requests': server.stats['requests'] - requests_before,
+        'kib_downloaded': round((server.stats['bytes'] - bytes_before) / 1024, 1),
+        'records': len(missions_df),
+    }
+
+async def main(args):
+    server = FakePotatoServer(latency=args.latency, conditional=not args.no_etag, maps=args.maps, records_per_map=args.records_per_map)
+    base_url = await server.start()
+    try:
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            store = SnapshotStore(snapshot_dir)
+            extractor = MissionDataExtractor(base_url=base_url)
+            results = [('cold', await timed_refresh(extractor, store, server))]
+            results.append(('warm, nothing changed', await timed_refresh(extractor, store, server)))
+            server.add_runs(args.maps_changed)
+            results.append((f'warm, {args.maps_changed} maps changed', await timed_refresh(extractor, store, server)))
+    finally:
+        await server.stop()
+
+    for label, result in results:
+        print(f'{label:>24}: ' + ', '.join(f'{key}={value}' for key, value in result.items()))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure what a snapshot refresh costs as a function of how many maps changed.')
+    parser.add_argument('--maps', type=int, default=40)
+    parser.add_argument('--records-per-map', type=int, default=500)
+    parser.add_argument('--maps-changed', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--no-etag', action='store_true', help='Serve without ETags so only the payload hash can detect unchanged maps')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import random
+
+MISSION_WORDS = ['broken', 'parts', 'mechanical', 'magic', 'empire', 'escalation', 'cave', 'mayhem', 'desert', 'storm',
+                 'iron', 'wheel', 'doom', 'siege', 'toxic', 'twilight', 'gear', 'grinder', 'frost', 'bite']
+DIFFICULTY_PREFIXES = ['int', 'adv', 'exp', 'rev']
+
+def generate_payloads(maps=40, missions_per_map=6, records_per_map=200, players=500, max_players_per_record=6, seed=0):
+    """
+    Generates synthetic /api/mapinfo, /api/speedrun and /api/missioninfo payloads shaped like potato.tf's responses.
+
+    Returns the mapinfo list, a dict of map name -> speedrun records and a dict of map name -> mission infos. The same
+    arguments and seed always produce the same payloads.
+    """
+    rng = random.Random(seed)
+    player_pool = [{
+        'steamid': str(76561197960265728 + index),
+        'personaname': f'Player {index}',
+        'profileurl': f'https://steamcommunity.com/profiles/{76561197960265728 + index}/',
+        'avatarmedium': f'https://avatars.steamstatic.com/{index:040x}_medium.jpg',
+    } for index in range(players)]
+
+    map_info = [{'name': f'mvm_{rng.choice(MISSION_WORDS)}_{index}'} for index in range(maps)]
+    speedruns = {}
+    mission_infos = {}
+    for item in map_info:
+        map_name = item['name']
+        missions = [f"{rng.choice(DIFFICULTY_PREFIXES)}_{rng.choice(MISSION_WORDS)}_{rng.choice(MISSION_WORDS)}" for _ in range(missions_per_map)]
+        speedruns[map_name] = [{
+            'map': map_name,
+            'mission': rng.choice(missions),
+            'time': rng.randint(600, 7200),
+            'timeAdded': rng.randint(1577836800, 1735689600),
+            'players': rng.sample(player_pool, rng.randint(1, min(max_players_per_record, players))),
+        } for _ in range(records_per_map)]
+        mission_infos[map_name] = [{'name': mission, 'map': map_name} for mission in missions]
+    return map_info, speedruns, mission_infos
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write synthetic potato.tf API payloads to a directory as JSON files.')
+    parser.add_argument('output_dir')
+    parser.add_argument('--maps', type=int, default=40)
+    parser.add_argument('--missions-per-map', type=int, default=6)
+    parser.add_argument('--records-per-map', type=int, default=200)
+    parser.add_argument('--players', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    map_info, speedruns, mission_infos = generate_payloads(maps=args.maps, missions_per_map=args.missions_per_map,
+                                                           records_per_map=args.records_per_map, players=args.players, seed=args.seed)
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, 'mapinfo.json'), 'w') as f:
+        json.dump(map_info, f)
+    for map_name, records in speedruns.items():
+        with open(os.path.join(args.output_dir, f'speedrun_{map_name}.json'), 'w') as f:
+            json.dump(records, f)
+    print(f"Wrote {len(map_info)} maps and {sum(len(records) for records in speedruns.values())} records to {args.output_dir}")
@@ -0,0 +1,101 @@
+import threading
+import time
+from Metrics import metrics
+
+class DataSnapshot:
+    """
+    One published version of the app's dataset.
+
+    A snapshot is never modified once published: a refresh builds a whole new one and swaps it in, so a session that
+    holds a snapshot keeps seeing consistent data for as long as it uses it.
+
+    Attributes:
+        version (int): Increases by one with every snapshot published by the same DataRefresher.
+        built_at (float): The time.time() at which the snapshot was published.
+        data (tuple): Whatever the refresher's build function returned.
+    """
+    def __init__(self, version, built_at, data):
+        self.version = version
+        self.built_at = built_at
+        self.data = data
+
+class DataRefresher:
+    """
+    Rebuilds a dataset on a background thread and publishes each result as a new DataSnapshot.
+
+    Readers only ever read the current attribute, which is replaced with a single assignment once a new snapshot is
+    complete, so they never wait on a refresh and never see a half-built dataset. A failed or empty build keeps the
+    previous snapshot in place until the next attempt.
+
+    Attributes:
+        build (callable): Returns the data to publish, or None to keep the current snapshot. Called with the arguments
+            given to refresh or load, and with none from the background thread.
+        interval (float): Seconds between two background refreshes, counted from the end of the previous one.
+            The background thread is not started when it is 0 or less.
+    """
+    def __init__(self, build, interval):
+        self.build = build
+        self.interval = interval
+        self.current = None
+        self.refresh_lock = threading.RLock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def refresh(self, *args):
+        """
+        Builds and publishes a new snapshot, returning whether one was published. Concurrent calls run one at a time.
+        """
+        with self.refresh_lock:
+            try:
+                with metrics.timer('stage.refresh'):
+                    data = self.build(*args)
+            except Exception as e:
+                print(f"Data refresh failed, keeping the current snapshot: {e}")
+                metrics.increment('refresh.failures')
+                return False
+            if data is None:
+                return False
+            self.publish(data)
+            return True
+
+    def publish(self, data):
+        """
+        Swaps in data built elsewhere, such as a first load made in the foreground, as the next snapshot.
+        """
+        version = self.current.version + 1 if self.current is not None else 1
+        self.current = DataSnapshot(version, time.time(), data)
+        metrics.increment('refresh.published')
+
+    def load(self, *args):
+        """
+        Builds the first snapshot in the foreground, unless another caller already did, and starts the background thread.
+
+        Callers arriving while the first build runs wait for it rather than starting their own.
+        """
+        with self.refresh_lock:
+            if self.current is None:
+                self.refresh(*args)
+            self.start()
+            return self.current
+
+    def start(self):
+        """
+        Starts the background thread unless it is already running. Checked under the refresh lock, so sessions that
+        arrive together never start a second one.
+        """
+        with self.refresh_lock:
+            if self.interval <= 0 or self.thread is not None:
+                return
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.run, name='DataRefresher', daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.refresh()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
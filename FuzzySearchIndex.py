@@ -0,0 +1,91 @@
+import re
+from collections import defaultdict
+import numpy as np
+
+WORD_PATTERN = re.compile(r'\w+')
+SUBSTRING_BONUS = 0.5  # Added to entries that contain the query as typed
+WHOLE_WORD_BONUS = 0.25  # Added to entries where the word being typed already matches a whole word
+CANDIDATE_FACTOR = 4  # Shortlisted entries rescored for substring matches, per match requested
+
+def word_trigrams(text, complete=True):
+    """
+    Returns the trigrams of every word of text, each word padded in front so that short prefixes still match.
+
+    Words are padded at the end too, except the last one of a query that is still being typed (complete=False).
+    """
+    words = WORD_PATTERN.findall(text.casefold())
+    trigrams = set()
+    for position, word in enumerate(words):
+        padded = '  ' + word + (' ' if complete or position < len(words) - 1 else '')
+        trigrams.update(padded[start:start + 3] for start in range(len(padded) - 2))
+    return trigrams
+
+class FuzzySearchIndex:
+    """
+    A trigram index for type-ahead search over one kind of entry (players, maps or missions).
+
+    Every entry is cut into word trigrams, and each trigram points at the entries holding it. A query is cut the same
+    way, the posting lists of its trigrams are counted with a single bincount, and entries are scored by the share of
+    the query's trigrams they hold, plus a bonus when the word being typed is already a whole word of theirs, so that
+    'player 12' puts Player 12 ahead of Player 120. A shortlist of the best entries then gets another bonus when it
+    contains the query as typed. Typos and out-of-order words still match on the trigrams they share, and ties keep
+    the entry order.
+
+    Attributes:
+        entries (list): (key, text) pairs, where key is what a search returns and text is what is matched. An empty
+            query returns the first entries, so they should come most relevant first.
+    """
+    def __init__(self, entries):
+        self.keys = [key for key, _ in entries]
+        self.texts = [text.casefold() for _, text in entries]
+        postings = defaultdict(list)
+        for row, text in enumerate(self.texts):
+            for trigram in word_trigrams(text):
+                postings[trigram].append(row)
+        self.postings = {trigram: np.array(rows, dtype=np.int32) for trigram, rows in postings.items()}
+
+    def search(self, query, limit=20):
+        """
+        Returns the keys of the limit entries that best match query, best first.
+        """
+        query = query.strip().casefold()
+        if not query:
+            return self.keys[:limit]
+        query_trigrams = word_trigrams(query, complete=False)
+        posting_lists = [self.postings[trigram] for trigram in query_trigrams if trigram in self.postings]
+        if not posting_lists:
+            return []
+
+        shared = np.bincount(np.concatenate(posting_lists), minlength=len(self.keys)).astype(np.int64)
+        # The one trigram a complete query has over one being typed ends the last word, e.g. '12 ' for 'player 12'
+        whole_word = np.zeros(len(self.keys), dtype=np.int64)
+        for trigram in word_trigrams(query) - query_trigrams:
+            if trigram in self.postings:
+                whole_word[self.postings[trigram]] = 1
+
+        # Shortlist on shared trigrams, then whole words, then entry order, all folded into one integer to partition on
+        rank_keys = (shared * 2 + whole_word) * len(self.keys) - np.arange(len(self.keys))
+        candidate_count = limit * CANDIDATE_FACTOR
+        if len(rank_keys) > candidate_count:
+            candidates = np.argpartition(-rank_keys, candidate_count)[:candidate_count]
+        else:
+            candidates = np.arange(len(rank_keys))
+        candidates = candidates[shared[candidates] > 0]
+        candidates = candidates[np.argsort(-rank_keys[candidates])]
+
+        scores = shared[candidates] / len(query_trigrams) + WHOLE_WORD_BONUS * whole_word[candidates]
+        scores += SUBSTRING_BONUS * np.array([query in self.texts[row] for row in candidates.tolist()], dtype=bool)
+        return [self.keys[row] for row in candidates[np.argsort(-scores, kind='stable')[:limit]]]
+
+def build_search_indexes(dataset, aggregates):
+    """
+    Returns a FuzzySearchIndex per kind: 'player' (by name and SteamID, most world records first), 'map' and 'mission'
+    (the 'Map | Mission' keys of the world record progression views).
+    """
+    players_df = dataset.players_df
+    return {
+        'player': FuzzySearchIndex([(steam_id, f'{persona_name} {steam_id}')
+                                    for steam_id, persona_name in zip(players_df['SteamID'], players_df['PersonaName'])]),
+        'map': FuzzySearchIndex([(map_name, map_name) for map_name in aggregates.scope_values('Map')]),
+        'mission': FuzzySearchIndex([(mission_key, mission_key) for mission_key in aggregates.mission_keys()]),
+    }
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from SharedDataset import read_only_frame
+
+LEADERBOARD_SCOPES = ('All', 'Map', 'Difficulty')
+LEADERBOARD_ORDERS = {
+    'World Records': ['WorldRecords', 'PersonalBests'],
+    'Personal Bests': ['PersonalBests', 'WorldRecords'],
+    'Total Records': ['Records', 'WorldRecords'],
+}
+COUNT_COLUMNS = ['WorldRecords', 'PersonalBests', 'Records']
+
+def group_slices(df, column):
+    """
+    Maps each value of column to the slice of rows holding it, for a frame already sorted by that column.
+    """
+    return {value: slice(positions[0], positions[-1] + 1)
+            for value, positions in df.groupby(column, observed=True, sort=False).indices.items()}
+
+class LeaderboardAggregates:
+    """
+    Leaderboard tables computed once per dataset version, so the dashboard views only slice and sort small tables.
+
+    Every table points at players by PlayerKey (a row position in players_df) and at records by RecordRow:
+    - rankings: world records, personal bests and total records per player, overall ('All'), per map and per
+      difficulty, sorted by scope value and world records with the rows of each scope value found in rankings_rows.
+    - progression: for each (Map, Mission), the records that lowered its best time in the order they were added
+      (timeAdded), ending with the current world record, with the rows of each mission found in progression_rows.
+    - teammates: how many records, and world records, every pair of players ran together, listed once from each
+      side and sorted by player and runs, with the rows of each player found in teammate_rows. pairs lists each
+      pair once, most runs first.
+
+    Attributes:
+        dataset (SharedDataset): The dataset the tables are computed from.
+    """
+    def __init__(self, dataset):
+        self.dataset = dataset
+        missions_df = dataset.missions_df
+        # A player listed twice on the same record is counted once
+        record_players = dataset.record_players.drop_duplicates()
+        record_rows = record_players['RecordRow'].to_numpy()
+        player_runs = missions_df[['Map', 'Difficulty']].iloc[record_rows].reset_index(drop=True)
+        player_runs['PlayerKey'] = record_players['PlayerKey'].to_numpy()
+        player_runs['WorldRecords'] = missions_df['World Record'].to_numpy()[record_rows].astype(np.int32)
+        player_runs['PersonalBests'] = 1 - player_runs['WorldRecords']
+        player_runs['Records'] = np.int32(1)
+        player_runs['All'] = 'All'
+
+        self.rankings = {}
+        self.rankings_rows = {}
+        for scope in LEADERBOARD_SCOPES:
+            ranking = player_runs.groupby([scope, 'PlayerKey'], observed=True)[COUNT_COLUMNS].sum().reset_index()
+            ranking = ranking.sort_values([scope, 'WorldRecords', 'PersonalBests'], ascending=[True, False, False], kind='stable')
+            self.rankings[scope] = read_only_frame(ranking.reset_index(drop=True), {})
+            self.rankings_rows[scope] = group_slices(self.rankings[scope], scope)
+
+        self.progression = self.build_progression(missions_df)
+        self.progression_rows = group_slices(self.progression, 'MissionKey')
+
+        self.teammates = self.build_teammates(record_players, missions_df['World Record'].to_numpy(), len(dataset.players_df))
+        self.teammate_rows = group_slices(self.teammates, 'PlayerKey')
+        pairs = self.teammates[self.teammates['PlayerKey'].to_numpy() < self.teammates['TeammateKey'].to_numpy()]
+        self.pairs = read_only_frame(pairs.sort_values(['Runs', 'WorldRecords'], ascending=False, kind='stable').reset_index(drop=True), {})
+
+    @staticmethod
+    def build_progression(missions_df):
+        records_df = pd.DataFrame({
+            'MissionKey': (missions_df['Map'].astype(str) + ' | ' + missions_df['Mission'].astype(str)).to_numpy(),
+            'TimeAdded': missions_df['TimeAdded'].to_numpy(),
+            'TimeSeconds': missions_df['TimeSeconds'].to_numpy(),
+            'RecordRow': np.arange(len(missions_df), dtype=np.int32),
+        })
+        # Runs added at the same moment are taken fastest first, so only the faster one counts as an improvement
+        records_df = records_df.sort_values(['MissionKey', 'TimeAdded', 'TimeSeconds'], kind='stable')
+        best_so_far = records_df.groupby('MissionKey', sort=False)['TimeSeconds'].cummin()
+        previous_best = best_so_far.groupby(records_df['MissionKey'], sort=False).shift()
+        improved = previous_best.isna() | (records_df['TimeSeconds'] < previous_best)
+        progression = records_df[improved].copy()
+        progression['Improvement'] = (previous_best[improved] - progression['TimeSeconds']).fillna(0).astype(np.int32)
+        return read_only_frame(progression.reset_index(drop=True), {'MissionKey': 'category'})
+
+    @staticmethod
+    def build_teammates(record_players, world_records, player_count):
+        # Pair every player of a record with every other player of the same record
+        pairs = record_players.merge(record_players, on='RecordRow', suffixes=('', 'Teammate'))
+        pairs = pairs[pairs['PlayerKey'] != pairs['PlayerKeyTeammate']]
+        # Count each pair through a single integer key rather than a two-column groupby
+        pair_keys = pairs['PlayerKey'].to_numpy(np.int64) * player_count + pairs['PlayerKeyTeammate'].to_numpy(np.int64)
+        unique_keys, pair_index, runs = np.unique(pair_keys, return_inverse=True, return_counts=True)
+        pair_world_records = np.bincount(pair_index, weights=world_records[pairs['RecordRow'].to_numpy()], minlength=len(unique_keys))
+        teammates = pd.DataFrame({
+            'PlayerKey': (unique_keys // player_count).astype(np.int32),
+            'TeammateKey': (unique_keys % player_count).astype(np.int32),
+            'Runs': runs.astype(np.int32),
+            'WorldRecords': pair_world_records.astype(np.int32),
+        })
+        order = np.lexsort((-teammates['WorldRecords'].to_numpy(), -teammates['Runs'].to_numpy(), teammates['PlayerKey'].to_numpy()))
+        return read_only_frame(teammates.iloc[order].reset_index(drop=True), {})
+
+    def scope_values(self, scope):
+        return list(self.rankings_rows[scope])
+
+    def top_players(self, scope, value, order, count):
+        """
+        Returns the count best players of one scope value (a map, a difficulty, or 'All') ranked by one of
+        LEADERBOARD_ORDERS, with their names.
+        """
+        rows = self.rankings_rows[scope].get(value)
+        if rows is None:
+            return pd.DataFrame(columns=['Rank', 'Player', *COUNT_COLUMNS])
+        ranking = self.rankings[scope].iloc[rows].sort_values(LEADERBOARD_ORDERS[order], ascending=False, kind='stable').head(count)
+        return pd.DataFrame({
+            'Rank': np.arange(1, len(ranking) + 1),
+            'Player': self.dataset.players_df['PersonaName'].to_numpy()[ranking['PlayerKey'].to_numpy()],
+            **{column: ranking[column].to_numpy() for column in COUNT_COLUMNS},
+        })
+
+    def mission_keys(self):
+        return list(self.progression_rows)
+
+    def mission_progression(self, mission_key):
+        """
+        Returns the world record progression of one 'Map | Mission', oldest first.
+        """
+        return self.progression.iloc[self.progression_rows.get(mission_key, slice(0, 0))]
+
+    def top_teammates(self, player_key, count):
+        return self.teammates.iloc[self.teammate_rows.get(player_key, slice(0, 0))].head(count)
+
+    def top_pairs(self, count):
+        """
+        Returns the count pairs of players who ran the most records together, each pair listed once.
+        """
+        return self.pairs.head(count)
@@ -0,0 +1,129 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds, in seconds, of the latency histogram buckets; the last bucket catches everything slower
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+NULL_TIMER = nullcontext()
+
+class Histogram:
+    """
+    A fixed-bucket histogram of observed values that also tracks their count, sum, min and max.
+
+    Attributes:
+        buckets (tuple, optional): The inclusive upper bound of each bucket (default is LATENCY_BUCKETS).
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """
+        Returns the upper bound of the bucket holding the q-th quantile, capped at the largest value observed.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total': round(self.total, 6),
+            'mean': round(self.total / self.count, 6) if self.count else None,
+            'min': round(self.min, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': round(self.max, 6) if self.count else None,
+            'buckets': {('+Inf' if bound == float('inf') else str(bound)): count for bound, count in zip(self.buckets, self.counts)},
+        }
+
+class Metrics:
+    """
+    A process-wide registry of counters and timing histograms, with optional structured JSON logging.
+
+    Instrumented code calls increment, observe and timer unconditionally. When the registry is disabled those return
+    straight away, and timer hands back a shared no-op context manager, so instrumentation left in hot paths costs
+    a method call and an attribute check.
+
+    Attributes:
+        enabled (bool, optional): Whether anything is recorded (default is the SHILL_METRICS environment variable == '1').
+        log_json (bool, optional): Whether every timing is also printed as a JSON line (default is SHILL_METRICS_LOG == '1').
+    """
+    def __init__(self, enabled=None, log_json=None):
+        self.enabled = os.environ.get('SHILL_METRICS', '0') == '1' if enabled is None else enabled
+        self.log_json = os.environ.get('SHILL_METRICS_LOG', '0') == '1' if log_json is None else log_json
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def increment(self, name, value=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value, **fields):
+        """
+        Records a duration in seconds in the histogram called name, and logs it as JSON along with fields.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].observe(value)
+        if self.log_json:
+            self.log(name, seconds=round(value, 6), **fields)
+
+    def timer(self, name, **fields):
+        if not self.enabled:
+            return NULL_TIMER
+        return self._timer(name, fields)
+
+    @contextmanager
+    def _timer(self, name, fields):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **fields)
+
+    def log(self, event, **fields):
+        print(json.dumps({'ts': round(time.time(), 3), 'event': event, **fields}, default=str), flush=True)
+
+    def snapshot(self):
+        """
+        Returns every counter and histogram summary as a JSON-serializable dict.
+        """
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {name: histogram.summary() for name, histogram in self.histograms.items()},
+            }
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+metrics = Metrics()
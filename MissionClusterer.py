@@ -1,31 +1,41 @@
-from gensim.models import Word2Vec
-from nltk.tokenize import word_tokenize
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
-import numpy as np
+import hashlib
+import json
+import os
+import pickle
 import random
-import nltk
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    # 'punkt' not found, download it
-    nltk.download('punkt')
-    print("Downloading 'punkt' dataset...")
-else:
-    pass
+import zlib
+import numpy as np
+import pandas as pd
+from MissionEmbeddings import create_backend
+
 class MissionClusterer:
     """
-    A class for clustering mission names based on Word2Vec embeddings and KMeans clustering.
+    A class for clustering mission names and assigning random emojis to each cluster.
+
+    Embedding and clustering are delegated to a pluggable backend from MissionEmbeddings: skip-gram Word2Vec with PCA and
+    KMeans ('word2vec'), or hashed character n-gram TF-IDF with MiniBatchKMeans ('tfidf').
+
+    When given a cache directory, the fitted backend is persisted along with the cluster assignments, keyed by a hash
+    of the backend and the mission-name set. An identical set reuses the stored assignments,
+    a set that only gained a few missions has them assigned to the nearest existing centroid, and a full re-cluster
+    only runs once the share of missions unseen at training time passes the drift threshold. The backends import
+    gensim and scikit-learn only when they fit or place missions, so reusing stored assignments never loads them.
 
-    This class clusters mission names into groups and assigns random emojis to each cluster.
-    
     Attributes:
         mission_names (list): A list of mission names to be clustered.
         n_clusters (int, optional): The number of clusters to create (default is 30).
+        cache_dir (str, optional): The directory the trained model and assignments are persisted to (default is None).
+        drift_threshold (float, optional): The share of unseen missions that triggers a full re-cluster (default is 0.2).
+        emoji_seed (int, optional): When set, a mission always gets the same emoji of its cluster (default is None, random).
+        backend (str or object, optional): The embedding backend name or instance (default is 'word2vec').
     """
-    def __init__(self, mission_names, n_clusters=30):
+    def __init__(self, mission_names, n_clusters=30, cache_dir=None, drift_threshold=0.2, emoji_seed=None, backend='word2vec'):
         self.mission_names = mission_names
         self.n_clusters = n_clusters
+        self.cache_dir = cache_dir
+        self.drift_threshold = drift_threshold
+        self.emoji_seed = emoji_seed
+        self.backend = create_backend(backend)
         self.cluster_names_emojis = {
     0: ['Timekeepers', '⏳', '🕰️', '🌟', '🚀', '🌈', '☣️', '🧚', '🏝️', '🎲', '🌌'],           
     1: ['Toxic Wastelands', '💀', '🔍', '🌊', '🌫️', '❓', '🌅', '🌒', '💧', '🎲', '🌠'],       
@@ -59,57 +69,117 @@ class MissionClusterer:
     29: ['Candlelit Secrets', '🕯️', '🌌', '🔍', '📦', '🔮', '📜', '📖', '🗝️', '🕰️', '📦'],   
 }
 
-        self.model = None
         self.clustered_missions = None
+        self.mission_index = {}
+        self.cluster_emojis = {}
 
-    def tokenize_missions(self):
-        return [word_tokenize(name.lower()) for name in self.mission_names]
-
-    def train_word2vec(self, tokenized_missions):
-        self.model = Word2Vec(
-            tokenized_missions,
-            vector_size=200,    # Increased vector size
-            window=20,          # Fixed or dynamic window size
-            min_count=1,
-            sg=1,               # Skip-gram model
-            hs=1,               # Using hierarchical softmax
-            negative=5,         # Negative sampling
-            alpha=0.03,         # Initial learning rate
-            min_alpha=0.0007,   # Minimum learning rate
-            sample=1e-3,        # Higher sample value for more sparseness
-            epochs=20           # Increased training epochs
-        )
-
-    def get_mission_vector(self, name):
-        vector = np.zeros(self.model.vector_size)
-        count = 0
-        for word in word_tokenize(name.lower()):
-            if word in self.model.wv:
-                vector += self.model.wv[word]
-                count += 1
-        return vector / count if count > 0 else vector
+    def mission_set_key(self):
+        names = '\n'.join(sorted(set(self.mission_names)))
+        return hashlib.sha256(f"{self.backend.name}\n{self.n_clusters}\n{names}".encode()).hexdigest()
 
-    def cluster_missions(self):
-        tokenized_missions = self.tokenize_missions()
-        self.train_word2vec(tokenized_missions)
-        
-        # Dimensionality Reduction
-        mission_vectors = np.array([self.get_mission_vector(name) for name in self.mission_names])
-        pca = PCA(n_components=0.95)  # Retain 95% variance
-        reduced_vectors = pca.fit_transform(mission_vectors)
-
-        # Clustering with optimized KMeans
-        kmeans = KMeans(n_clusters=self.n_clusters, random_state=0, n_init=10)
-        clusters = kmeans.fit_predict(reduced_vectors)
+    def cache_file(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def set_assignments(self, assignments):
         self.clustered_missions = {}
-        for cluster_id, mission_name in zip(clusters, self.mission_names):
-            self.clustered_missions.setdefault(cluster_id, []).append(mission_name)
+        for mission_name in self.mission_names:
+            self.clustered_missions.setdefault(assignments[mission_name], []).append(mission_name)
+
+        # Inverted index from lowercased mission to cluster, with each cluster's emojis resolved once
+        self.mission_index = {mission_name.lower(): cluster_id for mission_name, cluster_id in assignments.items()}
+        self.cluster_emojis = {
+            cluster_id: tuple(self.cluster_names_emojis[cluster_id][1:]) if cluster_id in self.cluster_names_emojis else ("❓",)
+            for cluster_id in self.clustered_missions
+        }
+
+    def save_cache(self, assignments, model_state=None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if model_state is not None:
+            tmp_path = self.cache_file('model.pkl.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(model_state, f)
+            os.replace(tmp_path, self.cache_file('model.pkl'))
+        tmp_path = self.cache_file('clusters.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': self.mission_set_key(), 'assignments': assignments}, f)
+        os.replace(tmp_path, self.cache_file('clusters.json'))
+
+    def load_cached_assignments(self):
+        """
+        Uses the stored assignments when they were computed for exactly this mission-name set.
+        """
+        try:
+            with open(self.cache_file('clusters.json')) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cached.get('key') != self.mission_set_key():
+            return False
+        self.set_assignments(cached['assignments'])
+        return True
+
+    def assign_incrementally(self):
+        """
+        Assigns missions unseen at training time to the nearest stored centroid, unless they exceed the drift threshold.
+        """
+        try:
+            with open(self.cache_file('model.pkl'), 'rb') as f:
+                model_state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False
+        if model_state.get('backend') != self.backend.name or model_state.get('n_clusters') != self.n_clusters:
+            return False
+
+        trained_assignments = model_state['assignments']
+        new_missions = [name for name in dict.fromkeys(self.mission_names) if name not in trained_assignments]
+        if len(new_missions) > self.drift_threshold * len(set(self.mission_names)):
+            return False
+
+        assignments = {name: trained_assignments[name] for name in self.mission_names if name in trained_assignments}
+        if new_missions:
+            self.backend = model_state['model']
+            new_clusters = self.backend.predict(new_missions)
+            assignments.update({name: int(cluster_id) for name, cluster_id in zip(new_missions, new_clusters)})
+        self.set_assignments(assignments)
+        self.save_cache(assignments)
+        return True
+
+    def cluster_missions(self):
+        if self.cache_dir and (self.load_cached_assignments() or self.assign_incrementally()):
+            return
+
+        clusters = self.backend.fit_predict(self.mission_names, self.n_clusters)
+        assignments = {mission_name: int(cluster_id) for cluster_id, mission_name in zip(clusters, self.mission_names)}
+        self.set_assignments(assignments)
+
+        if self.cache_dir:
+            model_state = {'backend': self.backend.name, 'n_clusters': self.n_clusters, 'assignments': assignments, 'model': self.backend}
+            self.save_cache(assignments, model_state)
 
     def get_random_cluster_emoji(self, mission_name):
         mission_name = mission_name.lower()
-        for cluster_id, missions in self.clustered_missions.items():
-            if mission_name in [m.lower() for m in missions]:
-                cluster_info = self.cluster_names_emojis.get(cluster_id + 1, ("Unknown", ["❓"]))
-                emojis = cluster_info[1:]
-                return random.choice(emojis) 
-        return "❓"
\ No newline at end of file
+        cluster_id = self.mission_index.get(mission_name)
+        if cluster_id is None:
+            return "❓"
+        emojis = self.cluster_emojis[cluster_id]
+        if self.emoji_seed is not None:
+            # crc32 rather than hash() so the choice stays the same across processes
+            return emojis[zlib.crc32(f"{self.emoji_seed}:{mission_name}".encode()) % len(emojis)]
+        return random.choice(emojis)
+
+    def get_cluster_emoji_column(self, missions):
+        """
+        Returns a Series with a cluster emoji for every mission in missions, resolving each distinct mission only once.
+        """
+        codes, uniques = pd.factorize(missions)
+        if self.emoji_seed is not None:
+            emojis = np.array([self.get_random_cluster_emoji(mission_name) for mission_name in uniques], dtype=object)
+            return pd.Series(emojis[codes], index=missions.index)
+
+        # Every distinct mission's emoji tuple laid end to end, so each row can draw from its own slice
+        choices = [self.cluster_emojis.get(self.mission_index.get(mission_name.lower()), ("❓",)) for mission_name in uniques]
+        lengths = np.array([len(emojis) for emojis in choices])
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        flat_emojis = np.array([emoji for emojis in choices for emoji in emojis], dtype=object)
+        picks = offsets[codes] + (np.random.random(len(codes)) * lengths[codes]).astype(int)
+        return pd.Series(flat_emojis[picks], index=missions.index)
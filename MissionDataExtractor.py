@@ -1,10 +1,23 @@
-from datetime import timedelta, datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta, datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import lru_cache
+from itertools import accumulate, chain
+from urllib.parse import urlsplit
+import hashlib
+import json
+import random
+import time
 import aiohttp
-from tenacity import retry, stop_after_attempt, wait_fixed
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from tenacity.wait import wait_base
+import numpy as np
 import pandas as pd
 import asyncio
 from tqdm.asyncio import tqdm_asyncio
+from Metrics import metrics
+from SpeedrunDecoder import decode_speedrun_records
 
 # Helper Functions
 def translate_victory_type(rank):
@@ -14,14 +27,140 @@ def get_emoji(rank):
     emojis = {1: "🏆", 2: "🥈", 3: "🥉", 4: "🎖️", 5: "🎉"}
     return emojis.get(rank, "🎉")
 
+@lru_cache(maxsize=None)
+def format_time(seconds):
+    return str(timedelta(seconds=int(seconds)))
+
+def format_date(date):
+    return date.strftime('%m/%d/%Y')
+
+def local_dates(timestamps):
+    """
+    Returns the local calendar day of each epoch second, as datetime.fromtimestamp would give it, as datetime64 values.
+    """
+    # The UTC offset depends on daylight saving time, so it is looked up for each distinct timestamp
+    unique_timestamps, inverse = np.unique(np.asarray(timestamps, dtype=np.int64), return_inverse=True)
+    offsets = np.array([time.localtime(timestamp).tm_gmtoff for timestamp in unique_timestamps.tolist()], dtype=np.int64)
+    local_days = (unique_timestamps + offsets) // 86400 * 86400
+    return pd.to_datetime(local_days[inverse], unit="s")
+
+def format_time_column(seconds):
+    """
+    Formats a Series of durations like format_time, formatting each distinct value only once.
+    """
+    codes, uniques = pd.factorize(seconds)
+    formatted = np.array([format_time(value) for value in uniques], dtype=object)
+    return pd.Series(formatted[codes], index=seconds.index)
+
+def parse_retry_after(headers):
+    """
+    Returns the delay in seconds requested by a Retry-After header (delta-seconds or HTTP date), or None.
+    """
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable(exception, max_wait=float('inf')):
+    # Rate limiting and server-side failures are worth another attempt, other client errors (404, 400...) are not
+    if isinstance(exception, aiohttp.ClientResponseError):
+        # A server asking for a longer pause than max_wait is given up on, rather than retried before it allows
+        retry_after = parse_retry_after(exception.headers)
+        if retry_after is not None and retry_after > max_wait:
+            return False
+        return exception.status == 429 or exception.status >= 500
+    return isinstance(exception, (aiohttp.ClientError, asyncio.TimeoutError))
+
+class wait_retry_after(wait_base):
+    """
+    A tenacity wait strategy that honours the server's Retry-After header and otherwise falls back to another strategy.
+
+    With Retry-After, the wait is the longer of the two plus a random jitter of up to jitter seconds, so the server's
+    pause is never cut short and requests throttled together do not all come back in lockstep. Only the fallback
+    is capped; a Retry-After too long to wait for is turned down by is_retryable instead.
+    """
+    def __init__(self, fallback, jitter):
+        self.fallback = fallback
+        self.jitter = jitter
+
+    def __call__(self, retry_state):
+        exception = retry_state.outcome.exception()
+        retry_after = parse_retry_after(getattr(exception, 'headers', None))
+        backoff = self.fallback(retry_state)
+        if retry_after is not None:
+            return max(retry_after, backoff) + random.uniform(0, self.jitter)
+        return backoff
+
+PROGRESS_INTERVAL = 1.0  # Minimum seconds between two partial results handed to collect()'s on_progress
+OFFLOAD_MODES = ('inline', 'thread', 'process')  # Where process_data runs during a crawl, see MissionDataExtractor
+
+# Each worker process builds its own extractor the first time it is handed a map, and keeps its lru_caches afterwards
+worker_extractor = None
+
+def run_in_worker(method, *args):
+    """
+    Runs one of MissionDataExtractor's processing methods inside a worker process.
+    """
+    global worker_extractor
+    if worker_extractor is None:
+        worker_extractor = MissionDataExtractor()
+    return getattr(worker_extractor, method)(*args)
+
+def select_map(df, map_name):
+    return df[df['MapKey'] == map_name] if 'MapKey' in df else df.iloc[0:0]
+
+def select_other_maps(df, map_name):
+    return df[df['MapKey'] != map_name] if 'MapKey' in df else df
+
 class MissionDataExtractor:
     """
     A utility class for extracting and processing mission and player data from Potato.tf's API.
 
     This class provides methods to fetch mission and player data, format it, and post-process the resulting dataframes.
+
+    Attributes:
+        base_url (str, optional): The root of the API, overridable to point at a local fake server (default is https://potato.tf).
+        max_requests_per_host (int, optional): The number of requests allowed in flight to a single host (default is 8).
+        pool_size (int, optional): The total number of pooled keep-alive connections (default is 32).
+        keepalive_timeout (float, optional): Seconds an idle pooled connection is kept open (default is 30).
+        total_timeout (float, optional): Seconds allowed for a whole request, body included (default is 60).
+        read_timeout (float, optional): Seconds allowed between two reads from the socket (default is 20).
+        max_attempts (int, optional): The number of attempts made for a request before giving up (default is 4).
+        backoff_base (float, optional): The scale of the jittered exponential backoff between attempts (default is 0.5).
+        backoff_max (float, optional): The longest backoff between attempts, and the longest Retry-After waited for
+            before giving up on a request (default is 30).
+        fetch_mission_info (bool, optional): Whether run() also downloads /api/missioninfo for every map (default is False,
+            process_data does not read it).
+        offload (str, optional): Where each map's process_data runs while the other maps download: 'inline' on the event
+            loop, 'thread' on a thread pool or 'process' on a process pool (default is 'inline').
+        offload_workers (int, optional): The size of the offload pool (default is None, the executor's own default).
     """
-    def __init__(self):
+    def __init__(self, base_url="https://potato.tf", max_requests_per_host=8, pool_size=32, keepalive_timeout=30,
+                 total_timeout=60, read_timeout=20, max_attempts=4, backoff_base=0.5, backoff_max=30, fetch_mission_info=False,
+                 offload='inline', offload_workers=None):
+        if offload not in OFFLOAD_MODES:
+            raise ValueError(f"Unknown offload mode {offload!r}, expected one of {', '.join(OFFLOAD_MODES)}")
         self.difficulty_mapping_inverted = {"Int ": "Intermediate", "Adv ": "Advanced", "Exp ": "Expert", "Rev ": "Reversed", "Reverse ": "Reversed"}
+        self.base_url = base_url.rstrip('/')
+        self.max_requests_per_host = max_requests_per_host
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.total_timeout = total_timeout
+        self.read_timeout = read_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.fetch_mission_info = fetch_mission_info
+        self.offload = offload
+        self.offload_workers = offload_workers
+        self.host_semaphores = {}
 
     @lru_cache(maxsize=None)
     def adjust_map_name(self, map_name):
@@ -31,14 +170,6 @@ class MissionDataExtractor:
     def replace_player_name(self, player_name):
         return player_name.replace('่', 'Googlayz')
 
-    @lru_cache(maxsize=None)
-    def format_time(self, seconds):
-        return str(timedelta(seconds=int(seconds)))
-
-    @lru_cache(maxsize=None)
-    def format_date(self, timestamp):
-        return datetime.fromtimestamp(timestamp).strftime('%d/%m/%Y')  # Corrected this line
-
     @lru_cache(maxsize=None)
     def get_nice_mission_name(self, mission):
         return mission.replace("_", " ").title()
@@ -49,97 +180,430 @@ class MissionDataExtractor:
                 return mission_name.replace(key, '').strip(), value
         return mission_name, None
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
+    def create_session(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.max_requests_per_host,
+                                         keepalive_timeout=self.keepalive_timeout, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.total_timeout, sock_read=self.read_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    def create_offload_pool(self):
+        """
+        Returns a new executor for process_data as set by offload, or None when maps are processed on the event loop.
+        """
+        if self.offload == 'thread':
+            return ThreadPoolExecutor(max_workers=self.offload_workers, thread_name_prefix='process_data')
+        if self.offload == 'process':
+            return ProcessPoolExecutor(max_workers=self.offload_workers)
+        return None
+
+    def get_host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.max_requests_per_host)
+        return self.host_semaphores[host]
+
+    async def fetch_raw(self, session, url, headers=None):
+        """
+        Returns the status, headers and body bytes of a GET request, retrying throttled and failed attempts.
+        """
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_retry_after(wait_random_exponential(multiplier=self.backoff_base, max=self.backoff_max), self.backoff_base),
+            retry=retry_if_exception(lambda exception: is_retryable(exception, self.backoff_max)),
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    metrics.increment('http.retries')
+                # The semaphore is only held while a request is in flight, never while backing off
+                async with self.get_host_semaphore(url):
+                    start = time.perf_counter()
+                    try:
+                        async with session.get(url, headers=headers) as response:
+                            metrics.increment(f'http.status.{response.status}')
+                            try:
+                                response.raise_for_status()
+                                body = await response.read()
+                            finally:
+                                # Throttled and failed responses are timed too, they are the ones worth diagnosing
+                                metrics.observe('http.request_seconds', time.perf_counter() - start, url=url, status=response.status)
+                    except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                        metrics.increment('http.connection_errors')
+                        raise
+                    metrics.increment('http.bytes', len(body))
+                    return response.status, response.headers, body
+
+    async def fetch_body(self, session, url):
+        _, _, body = await self.fetch_raw(session, url)
+        return body
+
     async def fetch_data(self, session, url):
-        async with session.get(url) as response:
-            response.raise_for_status()
-            return await response.json()
-
-    def format_speedrun_record(self, record):
-        players_info = record.get("players", [])
-
-        player_details = [{
-            "SteamID": player.get("steamid", ""),
-            "PersonaName": self.replace_player_name(player.get("personaname", "")),
-            "ProfileURL": player.get("profileurl", ""),
-            "AvatarURL": player.get("avatarmedium", ""),
-            "Map": self.adjust_map_name(record.get("map", "")),
-            "Mission": self.get_nice_mission_name(record.get("mission", "")),
-        } for player in players_info]
-
-        return {
-            "Time": self.format_time(record.get("time", 0)),
-            "Date": self.format_date(record.get("timeAdded", 0)),
-            "Players": [player['PersonaName'] for player in player_details],
-            "PlayerDetails": player_details
+        return json.loads(await self.fetch_body(session, url))
+
+    async def fetch_if_changed(self, session, url, validator):
+        """
+        Conditionally fetches a JSON payload using the ETag, Last-Modified and content hash stored in a validator dict.
+
+        Returns the decoded payload, or None when the server answered 304 or the body hashes to the stored value,
+        along with the validator to store for the next refresh.
+        """
+        headers = {}
+        if validator.get('etag'):
+            headers['If-None-Match'] = validator['etag']
+        if validator.get('last_modified'):
+            headers['If-Modified-Since'] = validator['last_modified']
+
+        status, response_headers, body = await self.fetch_raw(session, url, headers)
+        if status == 304:
+            return None, validator
+
+        new_validator = {
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'hash': hashlib.sha256(body).hexdigest(),
         }
+        # Servers without validators still resend the whole body, the hash at least spares the decoding and processing
+        if new_validator['hash'] == validator.get('hash'):
+            return None, new_validator
+        return json.loads(body), new_validator
+
+    def build_record_columns(self, speedrun_data):
+        """
+        Builds the columns of a map's mission and player frames in a single pass over its speedrun records.
+
+        Time and date are kept numeric (seconds and epoch seconds); display strings are only produced at render time
+        with format_time and format_date. Player rows point back at their record through RecordID, and each
+        record keeps the SteamIDs of its players next to their display names. A null field is read as a missing one.
+        """
+        record_columns = {"RawMission": [], "TimeSeconds": [], "TimeAdded": [], "Players": [], "SteamIDs": []}
+        player_columns = {"RecordID": [], "SteamID": [], "PersonaName": [], "ProfileURL": [], "AvatarURL": [], "RawMission": []}
+
+        for record_id, record in enumerate(speedrun_data):
+            players_info = record.get("players") or []
+            raw_mission = record.get("mission") or ""
+            persona_names = [self.replace_player_name(player.get("personaname") or "") for player in players_info]
+
+            record_columns["RawMission"].append(raw_mission)
+            record_columns["TimeSeconds"].append(record.get("time") or 0)
+            record_columns["TimeAdded"].append(record.get("timeAdded") or 0)
+            record_columns["Players"].append(persona_names)
+            record_columns["SteamIDs"].append([player.get("steamid") or "" for player in players_info])
+
+            for player, persona_name in zip(players_info, persona_names):
+                player_columns["RecordID"].append(record_id)
+                player_columns["SteamID"].append(player.get("steamid") or "")
+                player_columns["PersonaName"].append(persona_name)
+                player_columns["ProfileURL"].append(player.get("profileurl") or "")
+                player_columns["AvatarURL"].append(player.get("avatarmedium") or "")
+                player_columns["RawMission"].append(raw_mission)
+
+        return record_columns, player_columns
+
+    def build_struct_columns(self, speedrun_records):
+        """
+        Builds the same columns as build_record_columns from decoded SpeedrunRecord structs, a column at a time.
+
+        The players of every record are flattened into one list first, so each player column is a single comprehension
+        and each record's player lists are slices of it. Null fields get the defaults of missing ones, as in
+        build_record_columns.
+        """
+        record_players = [record.players or [] for record in speedrun_records]
+        players_info = list(chain.from_iterable(record_players))
+        player_counts = [len(players) for players in record_players]
+        bounds = list(accumulate(player_counts, initial=0))
+        persona_names = [self.replace_player_name(player.personaname or '') for player in players_info]
+        steam_ids = [player.steamid or '' for player in players_info]
+        raw_missions = [record.mission or '' for record in speedrun_records]
+
+        record_columns = {
+            "RawMission": raw_missions,
+            "TimeSeconds": [record.time or 0 for record in speedrun_records],
+            "TimeAdded": [record.timeAdded or 0 for record in speedrun_records],
+            "Players": [persona_names[start:end] for start, end in zip(bounds, bounds[1:])],
+            "SteamIDs": [steam_ids[start:end] for start, end in zip(bounds, bounds[1:])],
+        }
+        player_columns = {
+            "RecordID": np.repeat(np.arange(len(speedrun_records)), player_counts).tolist(),
+            "SteamID": steam_ids,
+            "PersonaName": persona_names,
+            "ProfileURL": [player.profileurl or '' for player in players_info],
+            "AvatarURL": [player.avatarmedium or '' for player in players_info],
+            "RawMission": np.repeat(np.array(raw_missions, dtype=object), player_counts).tolist(),
+        }
+        return record_columns, player_columns
+
+    def decode_record_columns(self, speedrun_body):
+        """
+        Decodes a map's raw /api/speedrun body into the columns of build_record_columns, or None when it has no records.
+
+        With msgspec installed, only the fields the app reads are decoded, into compact structs, rather than a dict
+        per record and per player. Without it, or for a body that does not match the schema, it goes through json.loads.
+        """
+        speedrun_records = decode_speedrun_records(speedrun_body)
+        if speedrun_records is not None:
+            return self.build_struct_columns(speedrun_records) if speedrun_records else None
+        speedrun_data = json.loads(speedrun_body)
+        return self.build_record_columns(speedrun_data) if speedrun_data else None
 
     def process_data(self, speedrun_data, mission_data, map_name):
-        mission_records = []
-        player_records = []
-        adjusted_map_name = self.adjust_map_name(map_name)
+        return self.process_columns(*self.build_record_columns(speedrun_data), map_name)
 
-        for record in speedrun_data:
-            formatted_record = self.format_speedrun_record(record)
-            mission_name, difficulty = self.extract_difficulty(self.get_nice_mission_name(record["mission"]))
-            mission_record = {"Map": adjusted_map_name, "Mission": mission_name, "Difficulty": difficulty, **formatted_record}
-            mission_record['Total Players'] = len(formatted_record['Players'])  # Calculate the total players for each mission
-            mission_records.append(mission_record)
-            player_records.extend(formatted_record["PlayerDetails"])
+    def process_columns(self, record_columns, player_columns, map_name):
+        adjusted_map_name = self.adjust_map_name(map_name)
 
-        missions_df = pd.DataFrame(mission_records)
-        missions_df['Rank'] = missions_df.groupby('Mission')['Time'].rank(method='dense').astype(int)
-        missions_df['World Record'] = missions_df['Rank'] == 1
+        # Mission names repeat across records, so resolve the nice name and difficulty once per distinct raw name
+        nice_missions = {raw: self.get_nice_mission_name(raw) for raw in set(record_columns["RawMission"])}
+        split_missions = {raw: self.extract_difficulty(nice) for raw, nice in nice_missions.items()}
+        raw_missions = pd.Series(record_columns["RawMission"], dtype=object)
+        time_added = np.asarray(record_columns["TimeAdded"], dtype=np.int64)
 
-        for index, row in missions_df[missions_df['World Record']].iterrows():
-            for player in row['PlayerDetails']:
-                player['WorldRecord'] = True
+        missions_df = pd.DataFrame({
+            "Map": adjusted_map_name,
+            "Mission": raw_missions.map(lambda raw: split_missions[raw][0]),
+            "Difficulty": raw_missions.map(lambda raw: split_missions[raw][1]),
+            "TimeSeconds": np.asarray(record_columns["TimeSeconds"], dtype=np.int64),
+            "Date": local_dates(time_added),
+            "TimeAdded": time_added,
+            "Players": record_columns["Players"],
+            "SteamIDs": record_columns["SteamIDs"],
+            "Total Players": [len(players) for players in record_columns["Players"]],
+        })
+        missions_df["Rank"] = missions_df.groupby("Mission")["TimeSeconds"].rank(method="dense").astype(int)
+        missions_df["World Record"] = missions_df["Rank"] == 1
 
-        players_df = pd.DataFrame(player_records)
+        players_df = pd.DataFrame({
+            "RecordID": np.asarray(player_columns["RecordID"], dtype=np.int64),
+            "SteamID": player_columns["SteamID"],
+            "PersonaName": player_columns["PersonaName"],
+            "ProfileURL": player_columns["ProfileURL"],
+            "AvatarURL": player_columns["AvatarURL"],
+            "Map": adjusted_map_name,
+            "Mission": pd.Series(player_columns["RawMission"], dtype=object).map(nice_missions),
+        })
+        # Vectorized join of each player row onto its record's World Record flag
+        players_df["WorldRecord"] = missions_df["World Record"].to_numpy()[players_df["RecordID"].to_numpy()]
         return missions_df, players_df
 
 
-    async def fetch_map_data(self, session, map_info_item):
+    def decode_and_process(self, speedrun_body, map_name):
+        """
+        Decodes a map's raw speedrun body and processes it, returning None frames when the map has no records.
+        """
+        columns = self.decode_record_columns(speedrun_body)
+        if columns is None:
+            return None, None
+        return self.process_columns(*columns, map_name)
+
+    def process_records_frame(self, map_records_df, map_name):
+        return self.process_data(map_records_df.to_dict('records'), None, map_name)
+
+    async def process_map(self, pool, map_name, method, *args):
+        """
+        Runs one of the processing methods for one map, on pool when given so that the event loop keeps serving the
+        other downloads.
+
+        The methods take raw bodies or a frame rather than decoded records, since pickling millions of small dicts to a
+        worker process costs more than decoding them there.
+        """
+        with metrics.timer('stage.process_data', map=map_name):
+            if pool is None:
+                return getattr(self, method)(*args)
+            # A worker process cannot be handed this extractor (its semaphores belong to the event loop), so it uses its own
+            if isinstance(pool, ProcessPoolExecutor):
+                return await asyncio.get_running_loop().run_in_executor(pool, run_in_worker, method, *args)
+            return await asyncio.get_running_loop().run_in_executor(pool, getattr(self, method), *args)
+
+    async def fetch_map_records(self, session, map_info_item):
+        """
+        Returns the map name with the undecoded bodies of its speedrun records and mission info, both None when the map
+        failed to load (the mission info body is also None unless fetch_mission_info is set).
+        """
         map_name = map_info_item['name']
-        speedrun_url = f"https://potato.tf/api/speedrun?map={map_name}"
-        mission_info_url = f"https://potato.tf/api/missioninfo?map={map_name}"
-        speedrun_data, mission_data = await asyncio.gather(
-            self.fetch_data(session, speedrun_url),
-            self.fetch_data(session, mission_info_url)
-        )
-        if speedrun_data and mission_data:
-            return self.process_data(speedrun_data, mission_data, map_name)
+        speedrun_url = f"{self.base_url}/api/speedrun?map={map_name}"
+        mission_info_url = f"{self.base_url}/api/missioninfo?map={map_name}"
+        try:
+            if self.fetch_mission_info:
+                speedrun_body, mission_body = await asyncio.gather(
+                    self.fetch_body(session, speedrun_url),
+                    self.fetch_body(session, mission_info_url)
+                )
+            else:
+                speedrun_body, mission_body = await self.fetch_body(session, speedrun_url), None
+        except Exception as e:
+            # A map that keeps failing is skipped on its own instead of aborting every other map
+            print(f"Failed to fetch data for {map_name}: {e}")
+            metrics.increment('crawl.map_failures')
+            return map_name, None, None
+        return map_name, speedrun_body, mission_body
 
-    async def run(self):
-        async with aiohttp.ClientSession() as session:
-            map_info_url = "https://potato.tf/api/mapinfo"
+    async def fetch_map_data(self, session, map_info_item, pool=None):
+        map_name, speedrun_body, _ = await self.fetch_map_records(session, map_info_item)
+        if speedrun_body is None:
+            return map_name, None, None
+        try:
+            missions_df, players_df = await self.process_map(pool, map_name, 'decode_and_process', speedrun_body, map_name)
+        except Exception as e:
+            # Like a failed download, a body that cannot be decoded or processed only costs its own map
+            print(f"Failed to process data for {map_name}: {e}")
+            metrics.increment('crawl.map_failures')
+            return map_name, None, None
+        return map_name, missions_df, players_df
+
+    async def fetch_map_info(self, session):
+        map_info_url = f"{self.base_url}/api/mapinfo"
+        try:
             map_info = await self.fetch_data(session, map_info_url)
-            if not map_info:
-                print("No map names were found.")
-                return None, None
-
-            tasks = [self.fetch_map_data(session, item) for item in map_info]
-            all_mission_frames = []
-            all_player_frames = []
-            for task in tqdm_asyncio.as_completed(tasks, desc="Fetching map data", total=len(map_info)):
-                missions_df, players_df = await task
-                if missions_df is not None:
-                    all_mission_frames.append(missions_df)
-                if players_df is not None:
-                    all_player_frames.append(players_df)
-
-            combined_missions_df = pd.concat(all_mission_frames, ignore_index=True) if all_mission_frames else pd.DataFrame()
-            combined_players_df = pd.concat(all_player_frames, ignore_index=True) if all_player_frames else pd.DataFrame()
-
-            combined_missions_df, combined_players_df = self.post_process_dataframe(combined_missions_df, combined_players_df)
-            return combined_missions_df, combined_players_df
+        except Exception as e:
+            print(f"Failed to fetch map info: {e}")
+            map_info = None
+        if not map_info:
+            print("No map names were found.")
+        return map_info
+
+    async def run(self):
+        """
+        Crawls every map and yields (map_name, missions_df, players_df) for each one as soon as it is processed.
+
+        The per-map frames are not post-processed; pass the generator to collect() to get the combined dataframes.
+        """
+        with self.create_offload_pool() or nullcontext() as pool:
+            async with self.create_session() as session:
+                map_info = await self.fetch_map_info(session)
+                if not map_info:
+                    return
+
+                tasks = [self.fetch_map_data(session, item, pool) for item in map_info]
+                for task in tqdm_asyncio.as_completed(tasks, desc="Fetching map data", total=len(map_info)):
+                    map_name, missions_df, players_df = await task
+                    if missions_df is not None:
+                        yield map_name, missions_df, players_df
+
+    async def collect(self, map_frames, on_progress=None, progress_interval=PROGRESS_INTERVAL):
+        """
+        Consumes a per-map frame generator (run() or refresh()) and returns the combined, post-processed dataframes.
+
+        When given, on_progress is called with the post-processed dataframes gathered so far and the number of maps
+        received, so that a caller can render partial results while the slowest maps are still loading. Each call
+        combines every frame received so far, so it is made for the first map and then at most once every
+        progress_interval seconds, rather than after every map, which would make a crawl quadratic in the map count.
+        """
+        all_mission_frames = []
+        all_player_frames = []
+        last_progress = float('-inf')
+        async for _, missions_df, players_df in map_frames:
+            all_mission_frames.append(missions_df)
+            all_player_frames.append(players_df)
+            if on_progress is not None and time.monotonic() - last_progress >= progress_interval:
+                on_progress(*self.combine_frames(all_mission_frames, all_player_frames), len(all_mission_frames))
+                last_progress = time.monotonic()
+
+        return self.combine_frames(all_mission_frames, all_player_frames)
+
+    def combine_frames(self, all_mission_frames, all_player_frames):
+        combined_missions_df = pd.concat(all_mission_frames, ignore_index=True) if all_mission_frames else pd.DataFrame()
+        combined_players_df = pd.concat(all_player_frames, ignore_index=True) if all_player_frames else pd.DataFrame()
+        return self.post_process_dataframe(combined_missions_df, combined_players_df)
+
+    async def fetch_changed_records(self, session, map_info_item, validator):
+        """
+        Conditionally fetches a map's full speedrun listing.
+
+        Returns the map name, the listing (None when the map is unchanged or failed) and the validator to store (None
+        when the map failed).
+        """
+        map_name = map_info_item['name']
+        speedrun_url = f"{self.base_url}/api/speedrun?map={map_name}"
+        try:
+            speedrun_data, validator = await self.fetch_if_changed(session, speedrun_url, validator)
+        except Exception as e:
+            print(f"Failed to fetch data for {map_name}: {e}")
+            return map_name, None, None
+        return map_name, speedrun_data, validator
+
+    async def refresh(self, store):
+        """
+        Brings a SnapshotStore up to date, yielding (map_name, missions_df, players_df) for every map as it completes.
+
+        Maps are requested conditionally (ETag / If-Modified-Since) and their payload hash is compared with the stored
+        one, so unchanged maps are neither decoded nor reprocessed. A map that did change has its stored records replaced
+        by the fresh listing, so runs deleted or edited upstream leave the snapshot too, and only that map is re-ranked.
+        An empty store results in a full crawl while a warm one only pays for the maps that changed. Maps without
+        changes are yielded straight from the snapshot. The snapshot is saved once the generator is exhausted, so pass
+        it to collect() to get the combined dataframes. When no record changed, only its checked_at and validators are
+        updated, so a restart keeps serving it while its saved_at still tells which data it holds.
+        """
+        records_df, missions_df, players_df, _ = store.load()
+        validators = store.load_validators()
+        pending_maps = set(records_df['map'])
+        changed = False
+        failed = False
+        with self.create_offload_pool() or nullcontext() as pool:
+            async with self.create_session() as session:
+                map_info = await self.fetch_map_info(session) or []
+                tasks = [self.fetch_changed_records(session, item, validators.get(item['name'], {})) for item in map_info]
+                for task in tqdm_asyncio.as_completed(tasks, desc="Refreshing map data", total=len(map_info)):
+                    map_name, speedrun_data, validator = await task
+                    pending_maps.discard(map_name)
+                    if validator is None:
+                        failed = True
+                    if speedrun_data is None:
+                        # An unchanged map's stored records match its new validator, a failed map keeps its old one
+                        if validator is not None:
+                            validators[map_name] = validator
+                        if (records_df['map'] == map_name).any():
+                            yield map_name, select_map(missions_df, map_name), select_map(players_df, map_name)
+                        continue
+
+                    # The listing is the map's whole content, so it replaces the stored records rather than being merged
+                    map_records_df = store.to_records_frame(speedrun_data, map_name)
+                    if not map_records_df.empty:
+                        try:
+                            map_missions_df, map_players_df = await self.process_map(pool, map_name, 'process_records_frame', map_records_df, map_name)
+                        except Exception as e:
+                            # The old validator is kept, so the next refresh downloads and reconciles the map again
+                            print(f"Failed to process data for {map_name}, keeping its stored records: {e}")
+                            metrics.increment('crawl.map_failures')
+                            failed = True
+                            if (records_df['map'] == map_name).any():
+                                yield map_name, select_map(missions_df, map_name), select_map(players_df, map_name)
+                            continue
+                        map_missions_df['MapKey'] = map_name
+                        map_players_df['MapKey'] = map_name
+
+                    records_df = pd.concat([records_df[records_df['map'] != map_name], map_records_df], ignore_index=True)
+                    missions_df = select_other_maps(missions_df, map_name)
+                    players_df = select_other_maps(players_df, map_name)
+                    # Only stored once the map's records are replaced, so a stale map is never marked current
+                    validators[map_name] = validator
+                    changed = True
+                    if map_records_df.empty:
+                        continue
+                    missions_df = pd.concat([missions_df, map_missions_df], ignore_index=True)
+                    players_df = pd.concat([players_df, map_players_df], ignore_index=True)
+                    yield map_name, map_missions_df, map_players_df
+
+        # Maps kept in the snapshot but missing from this crawl (removed from mapinfo, or mapinfo failed) are still served
+        for map_name in sorted(pending_maps):
+            yield map_name, select_map(missions_df, map_name), select_map(players_df, map_name)
+
+        if changed:
+            store.save(records_df, missions_df, players_df, validators)
+        elif map_info and not failed:
+            store.mark_checked(validators)
+
+    def load_snapshot(self, store):
+        """
+        Returns the post-processed missions and players dataframes held by a SnapshotStore without touching the network.
+        """
+        _, missions_df, players_df, _ = store.load()
+        return self.post_process_dataframe(missions_df, players_df)
 
     def post_process_dataframe(self, missions_df, players_df):
         if not missions_df.empty:
             missions_df['Map'] = missions_df['Map'].str.replace('_', ' ')
             missions_df['Mission'] = missions_df['Mission'].str.replace('_', ' ')
-            missions_df['Date'] = pd.to_datetime(missions_df['Date'], format='%d/%m/%Y').dt.strftime("%m/%d/%Y")
-            missions_df.sort_values(['Mission', 'Time'], inplace=True)
+            missions_df.sort_values(['Mission', 'TimeSeconds'], inplace=True)
     
         if not players_df.empty:
             players_df['WorldRecordsHeld'] = players_df.groupby('SteamID')['WorldRecord'].transform('sum')
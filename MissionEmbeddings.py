@@ -0,0 +1,138 @@
+import re
+import numpy as np
+
+# Words and single punctuation marks, which is all word_tokenize ever split the short mission names into
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def tokenize(name):
+    return TOKEN_PATTERN.findall(name.lower())
+
+class Word2VecBackend:
+    """
+    Embeds mission names by averaging skip-gram Word2Vec vectors of their words, then clusters them with PCA and KMeans.
+
+    Once fitted only the word vectors, PCA and KMeans are kept, which is all that is needed to place new missions.
+    The full Word2Vec training state is dropped.
+
+    Attributes:
+        name (str): The key the backend is registered and persisted under.
+    """
+    name = 'word2vec'
+
+    def __init__(self):
+        self.word_vectors = None
+        self.pca = None
+        self.kmeans = None
+
+    @staticmethod
+    def tokenize_missions(mission_names):
+        return [tokenize(name) for name in mission_names]
+
+    @staticmethod
+    def train_word2vec(tokenized_missions):
+        from gensim.models import Word2Vec
+        return Word2Vec(
+            tokenized_missions,
+            vector_size=200,    # Increased vector size
+            window=20,          # Fixed or dynamic window size
+            min_count=1,
+            sg=1,               # Skip-gram model
+            hs=1,               # Using hierarchical softmax
+            negative=5,         # Negative sampling
+            alpha=0.03,         # Initial learning rate
+            min_alpha=0.0007,   # Minimum learning rate
+            sample=1e-3,        # Higher sample value for more sparseness
+            epochs=20           # Increased training epochs
+        )
+
+    def get_mission_vector(self, name):
+        vector = np.zeros(self.word_vectors.vector_size)
+        count = 0
+        for word in tokenize(name):
+            if word in self.word_vectors:
+                vector += self.word_vectors[word]
+                count += 1
+        return vector / count if count > 0 else vector
+
+    def fit_predict(self, mission_names, n_clusters):
+        """
+        Trains the embedding and the clustering on mission_names and returns the cluster of each name.
+        """
+        from sklearn.cluster import KMeans
+        from sklearn.decomposition import PCA
+
+        self.word_vectors = self.train_word2vec(self.tokenize_missions(mission_names)).wv
+
+        # Dimensionality Reduction
+        mission_vectors = np.array([self.get_mission_vector(name) for name in mission_names])
+        self.pca = PCA(n_components=0.95)  # Retain 95% variance
+        reduced_vectors = self.pca.fit_transform(mission_vectors)
+
+        # Clustering with optimized KMeans
+        self.kmeans = KMeans(n_clusters=n_clusters, random_state=0, n_init=10)
+        return self.kmeans.fit_predict(reduced_vectors)
+
+    def predict(self, mission_names):
+        """
+        Returns the nearest fitted cluster of each name.
+        """
+        mission_vectors = np.array([self.get_mission_vector(name) for name in mission_names])
+        return self.kmeans.predict(self.pca.transform(mission_vectors))
+
+class HashedTfidfBackend:
+    """
+    Embeds mission names as TF-IDF weighted, hashed character n-grams and clusters them with MiniBatchKMeans.
+
+    The whole mission list is vectorized in one sparse pass with no vocabulary to build and no model to train, so
+    fitting costs about as much as a single KMeans run. Names that share word stems or fragments such as "mech" or "escal" end up close
+    together even when the words themselves differ.
+
+    Attributes:
+        ngram_range (tuple, optional): The smallest and largest character n-grams, taken inside word boundaries (default is (2, 4)).
+        n_features (int, optional): The number of hash buckets the n-grams are folded into (default is 2**12).
+        batch_size (int, optional): The MiniBatchKMeans batch size (default is 1024).
+        random_state (int, optional): The seed used to initialise the centroids (default is 0).
+    """
+    name = 'tfidf'
+
+    def __init__(self, ngram_range=(2, 4), n_features=2 ** 12, batch_size=1024, random_state=0):
+        self.ngram_range = ngram_range
+        self.n_features = n_features
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.vectorizer = None
+        self.tfidf = None
+        self.kmeans = None
+
+    def fit_predict(self, mission_names, n_clusters):
+        """
+        Fits the IDF weights and the clustering on mission_names and returns the cluster of each name.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+        self.vectorizer = HashingVectorizer(analyzer='char_wb', ngram_range=self.ngram_range, n_features=self.n_features,
+                                            alternate_sign=False, norm=None)
+        counts = self.vectorizer.transform(mission_names)
+        self.tfidf = TfidfTransformer(sublinear_tf=True)
+        vectors = self.tfidf.fit_transform(counts)
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=self.batch_size, random_state=self.random_state, n_init=3)
+        return self.kmeans.fit_predict(vectors)
+
+    def predict(self, mission_names):
+        """
+        Returns the nearest fitted cluster of each name.
+        """
+        return self.kmeans.predict(self.tfidf.transform(self.vectorizer.transform(mission_names)))
+
+EMBEDDING_BACKENDS = {backend.name: backend for backend in (Word2VecBackend, HashedTfidfBackend)}
+
+def create_backend(backend):
+    """
+    Returns a backend instance from either a registered name or an instance, which is passed through.
+    """
+    if isinstance(backend, str):
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend {backend!r}, expected one of {sorted(EMBEDDING_BACKENDS)}")
+        return EMBEDDING_BACKENDS[backend]()
+    return backend
@@ -1,5 +1,34 @@
+from functools import lru_cache
+import numpy as np
 from MissionClusterer import MissionClusterer
-from MissionDataExtractor import MissionDataExtractor, translate_victory_type, get_emoji
+from MissionDataExtractor import MissionDataExtractor, translate_victory_type, get_emoji, format_time, format_date, format_time_column
+
+RANK_EMOJIS = {rank: get_emoji(rank) for rank in range(1, 6)}
+PROMPT_CACHE_SIZE = 1024  # Prompts kept in memory, far more than a date search or an export batch shows at once
+
+@lru_cache(maxsize=PROMPT_CACHE_SIZE)
+def build_prompt(title, map_name, mission, time_seconds, date, difficulty, world_record, players, total_players):
+    record_status = "World Record" if world_record else "Personal Best"
+    # A missing difficulty comes out of the categorical Difficulty column as NaN rather than None
+    difficulty = difficulty if isinstance(difficulty, str) else None
+    
+    seo_keywords = ', '.join(['TF2 MvM', 'speedrun', map_name, mission, 'teamwork', 'gaming excellence', 'cooperative gaming', 'gaming strategies', 'gaming challenges', 'gaming tips and tricks', 'achievement unlocked', 'competitive gaming', 'esports', 'speed running', record_status])
+    prompt = (
+        f"**Title:** {title}\n\n"
+        "**Data:**\n"
+        f"- **Game Mode:** TF2 Mann vs. Machine\n"
+        f"- **Map:** {map_name}\n"
+        f"- **Mission:** {mission}\n"
+        f"- **Time:** {format_time(time_seconds)}\n"
+        f"- **Date:** {format_date(date)}\n"
+        f"- **Difficulty:** {difficulty}\n"
+        f"- **World Record Status:** {record_status}\n"
+        f"- **Players:** {', '.join(players)}\n"
+        f"- **Total Players:** {total_players}\n\n"
+        f"- **Dual Theme:** Mushroom Hunting + {map_name} & {mission}\n\n"
+        f"- **SEO Keywords:** {seo_keywords}\n\n"
+)
+    return prompt
 
 class MissionTitleUpdater:
     """
@@ -14,41 +43,41 @@ class MissionTitleUpdater:
     def __init__(self, clusterer):
         self.clusterer = clusterer
 
-    def generate_prompt_for_self(self, row):
+    @staticmethod
+    def generate_prompt_for_self(row, players):
         """
         Generate a directive prompt in Markdown format for AI to create a community-focused, engaging gaming achievement announcement.
+
+        Prompts are built on demand for the rows actually shown or exported and memoized, so repeated searches reuse them.
+        The record's player names are passed in, see SharedDataset.player_names.
         """
-        record_status = "World Record" if row['World Record'] else "Personal Best"
-        
-        seo_keywords = ', '.join(['TF2 MvM', 'speedrun', row['Map'], row['Mission'], 'teamwork', 'gaming excellence', 'cooperative gaming', 'gaming strategies', 'gaming challenges', 'gaming tips and tricks', 'achievement unlocked', 'competitive gaming', 'esports', 'speed running', record_status])
-        prompt = (
-            f"**Title:** {row['Title']}\n\n"
-            "**Data:**\n"
-            f"- **Game Mode:** TF2 Mann vs. Machine\n"
-            f"- **Map:** {row['Map']}\n"
-            f"- **Mission:** {row['Mission']}\n"
-            f"- **Time:** {row['Time']}\n"
-            f"- **Date:** {row['Date']}\n"
-            f"- **Difficulty:** {row['Difficulty']}\n"
-            f"- **World Record Status:** {'World Record' if row['World Record'] else 'Personal Best'}\n"
-            f"- **Players:** {', '.join(row['Players'])}\n"
-            f"- **Total Players:** {row['Total Players']}\n\n"
-            f"- **Dual Theme:** Mushroom Hunting + {row['Map']} & {row['Mission']}\n\n"
-            f"- **SEO Keywords:** {seo_keywords}\n\n"
-)
-        return prompt
+        return build_prompt(row['Title'], row['Map'], row['Mission'], row['TimeSeconds'], row['Date'], row['Difficulty'],
+                            bool(row['World Record']), tuple(players), row['Total Players'])
         
     def add_title_column(self, missions_df):
-        missions_df['Title'] = missions_df.apply(
-            lambda row: f"{self.clusterer.get_random_cluster_emoji(row['Mission'])} TF2 MvM Speedrun | Potato.tf: {row['Mission'].capitalize()} - {row['Difficulty']} | {get_emoji(row['Rank'])} {translate_victory_type(row['Rank'])[0]} | [{row['Time']}]",
-            axis=1
+        victory_types = np.where(missions_df['Rank'] == 1, translate_victory_type(1)[0], translate_victory_type(2)[0])
+        missions_df['Title'] = (
+            self.clusterer.get_cluster_emoji_column(missions_df['Mission'])
+            + " TF2 MvM Speedrun | Potato.tf: " + missions_df['Mission'].str.capitalize()
+            + " - " + missions_df['Difficulty'].astype(str)
+            + " | " + missions_df['Rank'].map(RANK_EMOJIS).fillna(get_emoji(None))
+            + " " + victory_types
+            + " | [" + format_time_column(missions_df['TimeSeconds']) + "]"
         )
         return missions_df
     
-    def add_ai_prompts_column(self, missions_df):
+    def add_ai_prompts_column(self, missions_df, players):
         """
-        Adds a new column 'AI_Prompt' to the DataFrame containing generated AI prompts for each record.
+        Adds a new column 'AI_Prompt' to the DataFrame containing generated AI prompts for each record, players holding
+        each record's player names in row order.
+
+        Meant for the rows being displayed or exported rather than the whole dataset.
         """
-        missions_df['AI_Prompt'] = missions_df.apply(self.generate_prompt_for_self, axis=1)
+        # Walks the columns together rather than iterrows, which builds a Series per row and dominates bulk exports
+        missions_df['AI_Prompt'] = [
+            build_prompt(title, map_name, mission, time_seconds, date, difficulty, bool(world_record), tuple(record_players), total_players)
+            for title, map_name, mission, time_seconds, date, difficulty, world_record, record_players, total_players in zip(
+                missions_df['Title'], missions_df['Map'], missions_df['Mission'], missions_df['TimeSeconds'], missions_df['Date'],
+                missions_df['Difficulty'], missions_df['World Record'], players, missions_df['Total Players'])
+        ]
         return missions_df
-    
\ No newline at end of file
@@ -0,0 +1,69 @@
+import html
+import os
+from functools import lru_cache
+
+CARD_CSS_PATH = os.path.join(os.path.dirname(__file__), 'Assets', 'cards.css')
+CARD_CACHE_SIZE = 1024  # Rendered cards kept in memory, enough for every page of a top-500 view
+CARD_HEIGHT = 340  # The height of a single card
+CARD_MARGIN = 20   # The total vertical margin around a card
+CARDS_PER_ROW = 5  # Number of cards in a single row
+
+# Filled in with str.format for every card; the stylesheet lives in Assets/cards.css and is sent once per page
+CARD_TEMPLATE = """
+<div class="card-container" style="background-image: url('{background_url}');">
+    <div class="card">
+        <div class="flip-card-inner">
+            <div class="flip-card-front">
+                <img src="{avatar_url}" alt="{persona_name}">
+                <div class="card-info">
+                    <h3>{persona_name}</h3>
+                    <p>Rank: #{rank}</p>
+                    <p>World Records: {world_records_held}</p>
+                </div>
+            </div>
+            <div class="flip-card-back">
+                <div class="card-back-content">
+                    <h1 style="box-shadow:  5px 5px 19px rgba(0,0,0,0.4), -5px -5px 19px rgba(0,0,0,0.4);">{persona_name}'s Details</h1>
+                    <p>{description}</p>
+                </div>
+            </div>
+        </div>
+    </div>
+</div>"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><style>{css}</style></head>
+<body><div class="card-grid">{cards}</div></body>
+</html>"""
+
+@lru_cache(maxsize=1)
+def load_card_css():
+    with open(CARD_CSS_PATH) as f:
+        return f.read()
+
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+def render_card(data_version, steam_id, rank, persona_name, avatar_url, world_records_held, description, background_url):
+    """
+    Returns the HTML of one player card, cached per player and data version.
+
+    The description is the profile summary HTML scraped from Steam and is inserted as is; everything else is escaped.
+    """
+    return CARD_TEMPLATE.format(
+        background_url=html.escape(background_url, quote=True),
+        avatar_url=html.escape(avatar_url, quote=True),
+        persona_name=html.escape(persona_name, quote=True),
+        rank=rank,
+        world_records_held=world_records_held,
+        description=description,
+    )
+
+def render_page(cards_html):
+    """
+    Wraps rendered cards into a single document carrying the card stylesheet once.
+    """
+    return PAGE_TEMPLATE.format(css=load_card_css(), cards=''.join(cards_html))
+
+def page_height(card_count):
+    rows = -(-card_count // CARDS_PER_ROW)
+    return rows * (CARD_HEIGHT + CARD_MARGIN)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from RecordDateIndex import RecordDateIndex
+
+class PlayerRecordIndex:
+    """
+    An inverted index from a player's SteamID to the records they took part in, built once per data load.
+
+    The dataset's record_players link table already holds one row per (record, player) pair as integer keys, where a
+    record is given by its row position in the missions frame. Grouping that table by player gives each player's record
+    positions, so selecting a player is a dict lookup and a positional take rather than a scan of every record's
+    players. The pairs are put in date order before grouping, so each player's records come out already sorted for
+    their RecordDateIndex. Every player's date index is built here, with the snapshot, so sessions only ever read
+    the index and never add to it.
+
+    Attributes:
+        dataset (SharedDataset): The dataset the index points into.
+    """
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.missions_df = dataset.missions_df
+        self.player_keys = pd.Index(dataset.players_df['SteamID'])
+        record_players = dataset.record_players.drop_duplicates()
+
+        # One stable sort of every pair by its record's date, which each player's group then inherits
+        dates = self.missions_df['Date'].to_numpy()[record_players['RecordRow'].to_numpy()]
+        record_players = record_players.iloc[np.argsort(dates, kind='stable')]
+        record_rows = record_players['RecordRow'].to_numpy()
+        self.records_by_player = {
+            player_key: record_rows[positions]
+            for player_key, positions in record_players.groupby('PlayerKey', sort=False).indices.items()
+        }
+        self.date_indexes = {
+            player_key: RecordDateIndex(self.missions_df, rows, presorted=True)
+            for player_key, rows in self.records_by_player.items()
+        }
+        self.empty_date_index = RecordDateIndex(self.missions_df, np.empty(0, dtype=np.int64), presorted=True)
+
+    def player_key(self, steam_id):
+        return self.player_keys.get_loc(steam_id) if steam_id in self.player_keys else None
+
+    def record_rows(self, steam_id):
+        """
+        Returns the missions frame row positions of a player's records, in date order.
+        """
+        return self.records_by_player.get(self.player_key(steam_id), np.empty(0, dtype=np.int32))
+
+    def records_for_player(self, steam_id):
+        return self.missions_df.iloc[self.record_rows(steam_id)]
+
+    def date_index(self, steam_id):
+        return self.date_indexes.get(self.player_key(steam_id), self.empty_date_index)
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+ENTRY_OVERHEAD_BYTES = 200  # Rough per-entry cost of the OrderedDict slot, tuple and str headers
+
+class ProfileCache:
+    """
+    A size-bounded, expiring cache of scraped Steam profiles shared by every session.
+
+    Entries only hold the extracted description HTML and background URL of a profile. The memory tier is an LRU bounded
+    by the total size of its entries rather than their count, so memory stays flat however many players are browsed.
+    Entries expire after a TTL so that profiles are scraped again on a schedule. An optional SQLite file acts as a
+    second tier that survives restarts; memory misses fall back to it while its entries are still fresh.
+
+    Attributes:
+        ttl (float, optional): Seconds a profile stays fresh (default is 6 hours).
+        max_bytes (int, optional): The approximate size the memory tier is allowed to grow to (default is 8 MiB).
+        disk_path (str, optional): The SQLite file backing the disk tier (default is None, memory only).
+    """
+    def __init__(self, ttl=6 * 60 * 60, max_bytes=8 * 1024 * 1024, disk_path=None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        self.lock = threading.Lock()
+        self.connection = None
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self.connection = sqlite3.connect(disk_path, check_same_thread=False)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS profiles (url TEXT PRIMARY KEY, description TEXT, background TEXT, expires_at REAL)')
+            self.connection.execute('DELETE FROM profiles WHERE expires_at < ?', (time.time(),))
+            self.connection.commit()
+
+    @staticmethod
+    def entry_size(url, profile):
+        return len(url.encode()) + sum(len(value.encode()) for value in profile) + ENTRY_OVERHEAD_BYTES
+
+    def _store_in_memory(self, url, profile, expires_at):
+        if url in self.entries:
+            self.current_bytes -= self.entries.pop(url)[2]
+        size = self.entry_size(url, profile)
+        self.entries[url] = (profile, expires_at, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes and self.entries:
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.stats['evictions'] += 1
+
+    def get(self, url):
+        """
+        Returns the cached (description_html, background_url) of a profile, or None when it is missing or expired.
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                profile, expires_at, size = entry
+                if expires_at > now:
+                    self.entries.move_to_end(url)
+                    self.stats['hits'] += 1
+                    return profile
+                del self.entries[url]
+                self.current_bytes -= size
+
+            if self.connection is not None:
+                row = self.connection.execute('SELECT description, background, expires_at FROM profiles WHERE url = ?', (url,)).fetchone()
+                if row is not None and row[2] > now:
+                    profile = (row[0], row[1])
+                    self._store_in_memory(url, profile, row[2])
+                    self.stats['disk_hits'] += 1
+                    return profile
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, url, profile, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self._store_in_memory(url, profile, expires_at)
+            if self.connection is not None:
+                self.connection.execute('INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?)', (url, profile[0], profile[1], expires_at))
+                self.connection.commit()
+
+    def get_many(self, urls):
+        """
+        Returns a dict of the fresh cached profiles among urls and the list of urls that still need to be scraped.
+        """
+        found = {}
+        missing_urls = []
+        for url in urls:
+            profile = self.get(url)
+            if profile is None:
+                missing_urls.append(url)
+            else:
+                found[url] = profile
+        return found, missing_urls
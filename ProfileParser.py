@@ -0,0 +1,119 @@
+import codecs
+from lxml import etree
+
+DEFAULT_BACKGROUND_URL = 'https://community.cloudflare.steamstatic.com/public/images/profile/2020/bg_dots.png'
+NO_DESCRIPTION_HTML = '<p>No description found</p>'
+
+def description_components(element):
+    """
+    Yields the HTML fragments of a profile summary in document order, one per text node, line break, image and link.
+
+    Mirrors walking a BeautifulSoup tree's descendants: a link contributes an anchor with its whole text and its
+    text nodes are then visited again like any other descendant.
+    """
+    if element.text and element.text.strip():
+        yield element.text.strip()
+    for child in element:
+        if child.tag is etree.Comment:
+            if child.text and child.text.strip():
+                yield child.text.strip()
+        elif isinstance(child.tag, str):
+            if child.tag == 'br':
+                yield '<br>'  # Change to HTML line break
+            elif child.tag == 'img':
+                # Keep the image tags as HTML and ensure they are displayed inline
+                yield f'<img src="{child.get("src")}" alt="{child.get("alt", "")}" style="display: inline; height: auto; max-width: 100%;">'
+            elif child.tag == 'a':
+                # Convert to HTML anchor tag
+                yield f'<a href="{child.get("href")}">{"".join(child.itertext())}</a>'
+            yield from description_components(child)
+        if child.tail and child.tail.strip():
+            yield child.tail.strip()
+
+def parse_description(element):
+    return ''.join(description_components(element))  # Return as HTML string
+
+def background_from_style(style):
+    if 'url(' in style:
+        return style.split('url(')[1].split(')')[0].replace("'", "").replace("\"", "")
+    return ''
+
+class ProfilePageExtractor:
+    """
+    A single-pass, incremental extractor for the parts of a Steam profile page shown on player cards.
+
+    The page is fed in chunks to lxml's pull parser, and only three things are looked for while it streams past:
+    the profile_summary div (turned into description HTML), the profile_animated_background div (its video poster)
+    and the profile_page div marked has_profile_background (the url() in its style). Steam emits the backgrounds before the profile
+    header, so extraction stops as soon as the summary has been closed and no further input is parsed.
+    """
+    def __init__(self):
+        self.parser = etree.HTMLPullParser(events=('start', 'end'))
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.description = None
+        self.animated_background = None
+        self.animated_background_element = None
+        self.static_background = None
+        self.done = False
+
+    def feed(self, chunk):
+        """
+        Parses the next chunk of the page (bytes or str) and returns True once every target has been found.
+        """
+        if not self.done:
+            self.parser.feed(self.decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+            self.process_events()
+        return self.done
+
+    def process_events(self):
+        for event, element in self.parser.read_events():
+            if not isinstance(element.tag, str) or element.tag != 'div':
+                continue
+            classes = (element.get('class') or '').split()
+            if event == 'start':
+                if 'profile_animated_background' in classes and self.animated_background_element is None:
+                    self.animated_background_element = element
+                elif 'profile_page' in classes and 'has_profile_background' in classes and self.static_background is None:
+                    self.static_background = background_from_style(element.get('style', ''))
+            elif element is self.animated_background_element:
+                video_tag = next((video for video in element.iter('video') if video.get('poster') is not None), None)
+                if video_tag is not None:
+                    # Ensure to return a URL without single quotes
+                    self.animated_background = video_tag.get('poster').replace("'", "")
+                else:
+                    self.animated_background = background_from_style(element.get('style', ''))
+            elif 'profile_summary' in classes and self.description is None:
+                self.description = parse_description(element)
+                self.done = True
+                return
+
+    def result(self):
+        """
+        Returns the (description_html, background_url) found so far.
+        """
+        description = self.description if self.description is not None else NO_DESCRIPTION_HTML
+        if self.animated_background is not None:
+            return description, self.animated_background
+        if self.static_background is not None:
+            return description, self.static_background
+        return description, DEFAULT_BACKGROUND_URL
+
+    def close(self):
+        """
+        Signals the end of the page, resolving targets that are still open, and returns the result.
+        """
+        if not self.done:
+            self.parser.feed(self.decoder.decode(b'', final=True))
+            self.parser.close()
+            self.process_events()
+        return self.result()
+
+def extract_profile(html, chunk_size=16384):
+    """
+    Returns the (description_html, background_url) of a whole profile page, stopping as soon as every target is found.
+    """
+    extractor = ProfilePageExtractor()
+    for start in range(0, len(html), chunk_size):
+        if extractor.feed(html[start:start + chunk_size]):
+            break
+    return extractor.close()
@@ -0,0 +1,69 @@
+import asyncio
+import time
+import aiohttp
+from Metrics import metrics
+from ProfileParser import ProfilePageExtractor, DEFAULT_BACKGROUND_URL
+
+class ProfileScraper:
+    """
+    A class for fetching Steam community profiles concurrently and extracting what the player cards display.
+
+    Each profile page is downloaded once and streamed through a ProfilePageExtractor as it arrives, which gets both the
+    profile description and the background URL in a single pass. A whole top-N selection is fetched as a single batch
+    with a bounded number of requests in flight.
+
+    Attributes:
+        max_concurrency (int, optional): The number of profile pages downloaded at once (default is 8).
+        total_timeout (float, optional): Seconds allowed for a single profile page (default is 20).
+        chunk_size (int, optional): The number of bytes handed to the extractor at a time (default is 16 KiB).
+    """
+    def __init__(self, max_concurrency=8, total_timeout=20, chunk_size=16384):
+        self.max_concurrency = max_concurrency
+        self.total_timeout = total_timeout
+        self.chunk_size = chunk_size
+
+    async def fetch_profile(self, session, semaphore, url):
+        extractor = ProfilePageExtractor()
+        try:
+            async with semaphore:
+                start = time.perf_counter()
+                async with session.get(url) as response:
+                    if response.status >= 400:
+                        metrics.increment('profiles.failures')
+                        return url, (f'<p>Error: {response.status}</p>', DEFAULT_BACKGROUND_URL), False
+                    async for chunk in response.content.iter_chunked(self.chunk_size):
+                        metrics.increment('profiles.bytes', len(chunk))
+                        if extractor.feed(chunk):
+                            break
+                    # Drain the rest of the page unparsed so the keep-alive connection can be reused
+                    while chunk := await response.content.read(self.chunk_size):
+                        metrics.increment('profiles.bytes', len(chunk))
+                metrics.observe('profiles.fetch_seconds', time.perf_counter() - start, url=url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed to fetch profile {url}: {e}")
+            metrics.increment('profiles.failures')
+            return url, ('', DEFAULT_BACKGROUND_URL), False
+        return url, extractor.close(), True
+
+    async def fetch_profiles(self, urls):
+        """
+        Fetches every distinct profile URL once.
+
+        Returns a dict of url -> (description_html, background_url) and the set of urls that could not be fetched,
+        whose entries hold placeholder values.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return {}, set()
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.total_timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            results = await asyncio.gather(*(self.fetch_profile(session, semaphore, url) for url in unique_urls))
+        profiles = {url: profile for url, profile, _ in results}
+        failed_urls = {url for url, _, ok in results if not ok}
+        return profiles, failed_urls
+
+    def fetch_profiles_sync(self, urls):
+        return asyncio.run(self.fetch_profiles(urls))
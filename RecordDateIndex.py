@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+RECORD_TYPES = ('all', 'world record', 'personal best')
+
+class RecordDateIndex:
+    """
+    Sorted date indexes over a set of records, one per record type, for logarithmic date lookups.
+
+    The records are given as row positions in the missions frame. They are ordered by date once, then partitioned into
+    all records, world records and personal bests, each holding a sorted datetime64 array of its dates and the matching
+    row positions. Exact, nearest and range lookups are then binary searches with searchsorted. Plain arrays rather
+    than DatetimeIndexes keep an index cheap enough to build for every player when the data is loaded.
+
+    Attributes:
+        missions_df (DataFrame): The missions frame the row positions point into.
+        record_rows (ndarray, optional): The row positions to index (default is None, every row).
+        presorted (bool, optional): Whether record_rows are already in date order (default is False).
+    """
+    def __init__(self, missions_df, record_rows=None, presorted=False):
+        self.missions_df = missions_df
+        rows = np.arange(len(missions_df)) if record_rows is None else np.asarray(record_rows, dtype=np.int64)
+        dates = missions_df['Date'].to_numpy()[rows]
+        if not presorted:
+            # Stable, so records sharing a date keep the frame's (Mission, TimeSeconds) order
+            order = np.argsort(dates, kind='stable')
+            rows, dates = rows[order], dates[order]
+        world_records = missions_df['World Record'].to_numpy()[rows]
+        self.partitions = {
+            'all': (dates, rows),
+            'world record': (dates[world_records], rows[world_records]),
+            'personal best': (dates[~world_records], rows[~world_records]),
+        }
+
+    def nearest_date(self, record_type, date):
+        """
+        Returns the indexed date closest to date (the earlier one on a tie), or None when there are no records.
+        """
+        dates, _ = self.partitions[record_type]
+        if len(dates) == 0:
+            return None
+        date = pd.Timestamp(date).to_datetime64()
+        position = dates.searchsorted(date)
+        if position == len(dates):
+            return pd.Timestamp(dates[-1])
+        if position == 0 or dates[position] - date < date - dates[position - 1]:
+            return pd.Timestamp(dates[position])
+        return pd.Timestamp(dates[position - 1])
+
+    def records_between(self, record_type, start, end):
+        """
+        Returns the records dated from start to end, both inclusive, in date order.
+        """
+        dates, rows = self.partitions[record_type]
+        start, end = pd.Timestamp(start).to_datetime64(), pd.Timestamp(end).to_datetime64()
+        return self.missions_df.iloc[rows[dates.searchsorted(start, side='left'):dates.searchsorted(end, side='right')]]
+
+    def records_on(self, record_type, date):
+        return self.records_between(record_type, date, date)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMNS = ['Map', 'Mission', 'Difficulty']  # Repeated across every record of a map or mission
+NARROW_DTYPES = {'TimeSeconds': np.int32, 'Rank': np.int16, 'Total Players': np.int16}
+ARROW_STRING_COLUMNS = ['Title']  # Unique per record, stored in one contiguous Arrow buffer instead of a Python str each
+
+def read_only(values):
+    values.flags.writeable = False
+    return values
+
+def read_only_column(series, dtype=None):
+    """
+    Returns a private copy of a column whose buffers refuse writes, encoded with dtype when given.
+    """
+    if dtype == 'category':
+        categorical = pd.Categorical(series)
+        return pd.Categorical.from_codes(read_only(categorical.codes.copy()), dtype=categorical.dtype)
+    if dtype == 'string[pyarrow]':
+        return pd.array(series, dtype=dtype)
+    return read_only(series.to_numpy(dtype=dtype, copy=True))
+
+def read_only_frame(df, dtypes):
+    # copy=False keeps one block per column, so pandas keeps using the read-only buffers rather than consolidating them
+    return pd.DataFrame({name: read_only_column(df[name], dtypes.get(name)) for name in df.columns}, copy=False)
+
+class SharedDataset:
+    """
+    The normalized, compact and read-only form of the post-processed dataframes, shared by reference by every session.
+
+    Records no longer carry their players as lists of names and SteamIDs. Instead, record_players is a link table of
+    integer keys (RecordRow, PlayerKey) giving row positions in missions_df and players_df, sorted by record and
+    keeping each record's player order, with record_offsets marking where each record's players start. Repeated strings
+    are categorical, integers are narrowed and the per-record title lives in an Arrow string buffer.
+
+    Every numpy buffer is flagged read-only, so code that tries to modify a shared frame in place fails loudly instead
+    of changing the data under other sessions. Reads need no defensive copy: selecting rows already returns new frames.
+
+    Attributes:
+        missions_df (DataFrame): The post-processed missions frame, with its Players and SteamIDs list columns.
+        players_df (DataFrame): The post-processed players frame, one row per SteamID.
+    """
+    def __init__(self, missions_df, players_df):
+        # The player order within a record comes from the record's list, so its prompt names players as before
+        steam_ids = missions_df['SteamIDs'].reset_index(drop=True).explode().dropna()
+        player_keys = pd.Index(players_df['SteamID']).get_indexer(steam_ids)
+        known = player_keys >= 0
+        record_rows = steam_ids.index.to_numpy()[known]
+        self.record_players = pd.DataFrame({
+            'RecordRow': read_only(record_rows.astype(np.int32)),
+            'PlayerKey': read_only(player_keys[known].astype(np.int32)),
+        }, copy=False)
+        self.record_offsets = read_only(np.concatenate([[0], np.cumsum(np.bincount(record_rows, minlength=len(missions_df)))]))
+
+        # MapKey only tells a refresh which stored rows belong to a map, it is never read from the shared frames
+        mission_columns = missions_df.columns.drop(['Players', 'SteamIDs', 'MapKey'], errors='ignore')
+        self.missions_df = read_only_frame(missions_df[mission_columns].reset_index(drop=True), {
+            **{name: 'category' for name in CATEGORY_COLUMNS},
+            **NARROW_DTYPES,
+            **{name: 'string[pyarrow]' for name in ARROW_STRING_COLUMNS if name in mission_columns},
+        })
+        self.players_df = read_only_frame(players_df.reset_index(drop=True), {'WorldRecordsHeld': np.int32})
+
+    def player_keys(self, record_row):
+        return self.record_players['PlayerKey'].to_numpy()[self.record_offsets[record_row]:self.record_offsets[record_row + 1]]
+
+    def player_names(self, record_row):
+        """
+        Returns the display names of a record's players, in the order the record lists them.
+        """
+        return tuple(self.players_df['PersonaName'].to_numpy()[self.player_keys(record_row)])
+
+    def players_column(self, field):
+        """
+        Returns a list holding, for every record in missions_df order, the list of its players' values of field.
+        """
+        values = self.players_df[field].to_numpy()[self.record_players['PlayerKey'].to_numpy()]
+        return [chunk.tolist() for chunk in np.split(values, self.record_offsets[1:-1])]
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import os
+import time
+from MissionClusterer import MissionClusterer
+from MissionDataExtractor import MissionDataExtractor, format_time_column
+from MissionTitleUpdater import MissionTitleUpdater
+from SharedDataset import SharedDataset
+from SnapshotStore import SnapshotStore
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), 'Snapshot')
+CLUSTERER_CACHE_DIR = os.path.join(SNAPSHOT_DIR, 'clusterer')  # Shared with the app, so both give missions the same emojis
+EXPORT_FORMATS = ('jsonl', 'parquet')
+EXPORT_COLUMNS = ['Map', 'Mission', 'Difficulty', 'TimeSeconds', 'Time', 'Date', 'TimeAdded', 'Rank', 'World Record',
+                  'Players', 'SteamIDs', 'Total Players', 'Title', 'AI_Prompt']
+
+class ShillExport:
+    """
+    A headless batch export of every record's title and AI prompt, for archive backfills without the Streamlit UI.
+
+    Maps are crawled concurrently as in the app, with the extractor's 'process' offload handing each map's records to a
+    process pool as soon as they arrive, so process_data runs on every core while the remaining maps are still
+    downloading. The combined frames then go through the same clustering and title steps as the app before being
+    written as JSONL or Parquet.
+
+    Attributes:
+        base_url (str, optional): The root of the potato.tf API (default is https://potato.tf).
+        workers (int, optional): The number of worker processes for process_data (default is None, one per core).
+        backend (str, optional): The mission clustering backend, see MissionEmbeddings (default is 'word2vec').
+        cache_dir (str, optional): Where the clustering model is cached (default is the app's CLUSTERER_CACHE_DIR).
+        emoji_seed (str, optional): Seeds the emoji picked for each mission so repeated exports agree (default is None).
+    """
+    def __init__(self, base_url="https://potato.tf", workers=None, backend='word2vec', cache_dir=CLUSTERER_CACHE_DIR, emoji_seed=None):
+        self.extractor = MissionDataExtractor(base_url=base_url, offload='process', offload_workers=workers)
+        self.workers = workers
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.emoji_seed = emoji_seed
+
+    async def crawl(self):
+        """
+        Crawls every map and returns the combined, post-processed missions and players dataframes.
+        """
+        return await self.extractor.collect(self.extractor.run())
+
+    def load_snapshot(self, snapshot_dir):
+        return self.extractor.load_snapshot(SnapshotStore(snapshot_dir))
+
+    def build_records(self, missions_df, players_df):
+        """
+        Adds the Title, AI_Prompt and display Time columns to every record, and returns the columns to export in a stable order.
+        """
+        mission_names = missions_df['Mission'].unique().tolist()
+        clusterer = MissionClusterer(mission_names, cache_dir=self.cache_dir, emoji_seed=self.emoji_seed, backend=self.backend)
+        clusterer.cluster_missions()
+
+        title_updater = MissionTitleUpdater(clusterer)
+        # Goes through the same dataset as the app, so exported prompts name players exactly as the app's do
+        dataset = SharedDataset(title_updater.add_title_column(missions_df), players_df)
+        player_names = dataset.players_column('PersonaName')
+        missions_df = dataset.missions_df.assign(Players=player_names, SteamIDs=dataset.players_column('SteamID'))
+        missions_df = title_updater.add_ai_prompts_column(missions_df, player_names)
+        missions_df['Time'] = format_time_column(missions_df['TimeSeconds'])
+        # Maps finish crawling in any order, so sort on a full key to make repeated exports line up record for record
+        missions_df = missions_df.sort_values(['Map', 'Mission', 'Difficulty', 'TimeSeconds', 'TimeAdded'], kind='stable')
+        return missions_df[EXPORT_COLUMNS].reset_index(drop=True)
+
+    @staticmethod
+    def write(records_df, path, export_format):
+        # Written next to the target first, so an interrupted export never leaves a truncated file behind
+        tmp_path = path + '.tmp'
+        if export_format == 'parquet':
+            records_df.to_parquet(tmp_path, index=False)
+        else:
+            records_df.to_json(tmp_path, orient='records', lines=True, date_format='iso', force_ascii=False)
+        os.replace(tmp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every speedrun record's title and AI prompt without the Streamlit UI.")
+    parser.add_argument('output', help='The file to write')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help='The output format (default is guessed from the file extension, else jsonl)')
+    parser.add_argument('--base-url', default='https://potato.tf', help='The root of the potato.tf API')
+    parser.add_argument('--snapshot', nargs='?', const=SNAPSHOT_DIR,
+                        help="Read the records from a stored snapshot instead of crawling (default directory is the app's)")
+    parser.add_argument('--workers', type=int, help='Worker processes for map processing (default is one per core)')
+    parser.add_argument('--backend', default=os.environ.get('SHILL_CLUSTER_BACKEND', 'word2vec'), help="'word2vec' or 'tfidf'")
+    parser.add_argument('--cluster-cache', default=CLUSTERER_CACHE_DIR, help='Where the clustering model is cached')
+    parser.add_argument('--emoji-seed', default=os.environ.get('SHILL_EMOJI_SEED'), help='Seed for the emoji picked per mission')
+    args = parser.parse_args()
+    export_format = args.format or ('parquet' if args.output.endswith('.parquet') else 'jsonl')
+
+    export = ShillExport(base_url=args.base_url, workers=args.workers, backend=args.backend, cache_dir=args.cluster_cache, emoji_seed=args.emoji_seed)
+    start = time.perf_counter()
+    if args.snapshot:
+        missions_df, players_df = export.load_snapshot(args.snapshot)
+    else:
+        missions_df, players_df = asyncio.run(export.crawl())
+    if missions_df.empty:
+        print("No records were found, nothing was exported.")
+        raise SystemExit(1)
+    print(f"Loaded {len(missions_df)} records in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    records_df = export.build_records(missions_df, players_df)
+    ShillExport.write(records_df, args.output, export_format)
+    print(f"Wrote {len(records_df)} records to {args.output} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main()
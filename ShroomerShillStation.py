@@ -1,16 +1,22 @@
 import streamlit as st
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup, NavigableString, Tag, SoupStrainer
 import os
-from functools import lru_cache
 import asyncio
+from DataRefresher import DataRefresher
+from FuzzySearchIndex import build_search_indexes
+from LeaderboardAggregates import LeaderboardAggregates, LEADERBOARD_ORDERS, LEADERBOARD_SCOPES
 from MissionClusterer import MissionClusterer
-from MissionDataExtractor import MissionDataExtractor
+from MissionDataExtractor import MissionDataExtractor, format_date, format_time, format_time_column
 from MissionTitleUpdater import MissionTitleUpdater
+from Metrics import metrics
+from PlayerCards import render_card, render_page, page_height
+from PlayerRecordIndex import PlayerRecordIndex
+from ProfileCache import ProfileCache
+from ProfileScraper import ProfileScraper, DEFAULT_BACKGROUND_URL
+from SharedDataset import SharedDataset
+from SnapshotStore import SnapshotStore
 from datetime import datetime
 import streamlit.components.v1 as components
-from bs4 import SoupStrainer
 
 import warnings
 warnings.filterwarnings('ignore', message='missing ScriptRunContext')
@@ -19,325 +25,271 @@ warnings.filterwarnings('ignore', module='concurrent.futures')
 warnings.filterwarnings('ignore', message='.*ThreadPoolExecutor.*')
 warnings.filterwarnings('ignore', module='streamlit')
 
-class DataFetcher:
-    @staticmethod
-    @lru_cache(maxsize=128)
-    def cached_requests_get(*args, **kwargs):
-        return requests.get(*args, **kwargs)
+API_URL = os.environ.get('SHILL_API_URL', 'https://potato.tf')  # Point at a local Benchmarks/FakePotatoServer.py to run offline
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), 'Snapshot')
+SNAPSHOT_MAX_AGE = 60 * 60  # Seconds before a startup refreshes the snapshot instead of serving it as is
+REFRESH_INTERVAL = float(os.environ.get('SHILL_REFRESH_INTERVAL', SNAPSHOT_MAX_AGE))  # Seconds between background refreshes, 0 disables them
+OFFLOAD = os.environ.get('SHILL_OFFLOAD', 'inline')  # Where each map is processed while the others download, see MissionDataExtractor
+CLUSTERER_CACHE_DIR = os.path.join(SNAPSHOT_DIR, 'clusterer')  # Trained mission clustering model and assignments
+EMOJI_SEED = os.environ.get('SHILL_EMOJI_SEED')  # Set to give each mission the same emoji on every reload
+CLUSTER_BACKEND = os.environ.get('SHILL_CLUSTER_BACKEND', 'word2vec')  # 'word2vec' or 'tfidf', see MissionEmbeddings
+PROFILE_CACHE_TTL = 6 * 60 * 60  # Seconds before a scraped Steam profile is scraped again
+PROFILE_CACHE_ERROR_TTL = 5 * 60  # Seconds before a profile that failed to load is retried
+PROFILE_CACHE_MAX_BYTES = 8 * 1024 * 1024  # Memory allowed for scraped profiles
+PROFILE_CACHE_PATH = os.path.join(SNAPSHOT_DIR, 'profiles.sqlite') if os.environ.get('SHILL_PROFILE_CACHE_DISK', '1') == '1' else None
+CARDS_PER_PAGE = 50  # Player cards rendered at once, larger top-N selections are split into pages
+RECORD_SEARCH_MAX_RESULTS = 50  # Prompts rendered per search, a wide date range is cut off after this many
+LEADERBOARD_SIZE = 50  # Players, teammates or pairs listed by each leaderboard view
+SEARCH_MATCHES = 20  # Ranked matches sent to the browser by each search picker
+PROGRESSIVE_LOADING = os.environ.get('SHILL_PROGRESSIVE_LOADING', '1') == '1'  # Render partial results while maps are still loading
 
+class DataFetcher:
     @staticmethod
     @st.cache_resource
-    def fetch_description(url):
-        try:
-            response = DataFetcher.cached_requests_get(url)
-            if response.ok:  # Checks for all 2XX status codes
-                strainer = SoupStrainer('div', class_='profile_summary')
-                soup = BeautifulSoup(response.content, 'lxml', parse_only=strainer)
-                description_tag = soup.find()
-                return UtilityFunctions.parse_description(description_tag) if description_tag else '<p>No description found</p>'
-            else:
-                return f'<p>Error: {response.status_code}</p>'
-        except requests.RequestException as e:
-            st.error(f'Request error in fetch_description: {e}')
-            return ''
-        except Exception as e:
-            st.error(f'Unexpected error in fetch_description: {e}')
-            return ''
+    def get_profile_cache():
+        # Shared by every session, the cache bounds its own size and expires profiles so they are scraped on a schedule
+        return ProfileCache(ttl=PROFILE_CACHE_TTL, max_bytes=PROFILE_CACHE_MAX_BYTES, disk_path=PROFILE_CACHE_PATH)
 
     @staticmethod
-    @st.cache_resource
-    def fetch_background_url(url):
-        try:
-            response = DataFetcher.cached_requests_get(url)
-            if response.ok:
-                soup = BeautifulSoup(response.content, 'lxml')
-                background_div = soup.find('div', class_='profile_animated_background')
-                if not background_div:
-                    background_div = soup.find('div', class_='no_header profile_page has_profile_background')
-                if not background_div:
-                    background_div = soup.find('div', class_='no_header profile_page has_profile_background full_width_background')
-                if not background_div:
-                    return 'https://community.cloudflare.steamstatic.com/public/images/profile/2020/bg_dots.png'
-
-                if background_div:
-                    video_tag = background_div.find('video', poster=True)
-                    style = background_div.get('style', '')
-                    if video_tag and 'poster' in video_tag.attrs:
-                        # Ensure to return a URL without single quotes
-                        return video_tag['poster'].replace("'", "")
-                    elif 'url(' in style:
-                        return style.split('url(')[1].split(')')[0].replace("'", "").replace("\"", "")
-                return ''
-            else:
-                return f'<p>Error: {response.status_code}</p>'
-        except requests.RequestException as e:
-            st.error(f'Request error in fetch_background_url: {e}')
-            return ''
-        except Exception as e:
-            st.error(f'Unexpected error in fetch_background_url: {e}')
-            return ''
+    def fetch_profiles(urls):
+        """
+        Returns a dict of url -> (description_html, background_url), scraping the missing profiles as one batch.
+        """
+        cache = DataFetcher.get_profile_cache()
+        profiles, missing_urls = cache.get_many(urls)
+        if missing_urls:
+            try:
+                with metrics.timer('stage.profile_scrape', profiles=len(missing_urls)):
+                    scraped_profiles, failed_urls = ProfileScraper().fetch_profiles_sync(missing_urls)
+            except Exception as e:
+                st.error(f'Unexpected error in fetch_profiles: {e}')
+                scraped_profiles, failed_urls = {}, set()
+            for url, profile in scraped_profiles.items():
+                cache.put(url, profile, ttl=PROFILE_CACHE_ERROR_TTL if url in failed_urls else None)
+            profiles.update(scraped_profiles)
+        return {url: profiles.get(url, ('', DEFAULT_BACKGROUND_URL)) for url in urls}
 
     @staticmethod
-    async def async_fetch_data():
-        extractor = MissionDataExtractor()
-        missions_df, players_df = await extractor.run()
+    async def async_fetch_data(on_progress=None, refresh=False):
+        """
+        Returns the SharedDataset and its player index, or None when refresh is set and no map changed since the
+        stored snapshot was written.
+        """
+        extractor = MissionDataExtractor(base_url=API_URL, offload=OFFLOAD)
+        store = SnapshotStore(SNAPSHOT_DIR)
+        if not refresh and store.age() < SNAPSHOT_MAX_AGE:
+            with metrics.timer('stage.load_snapshot'):
+                missions_df, players_df = extractor.load_snapshot(store)
+        else:
+            saved_at = store.saved_at()
+            with metrics.timer('stage.fetch_data'):
+                missions_df, players_df = await extractor.collect(extractor.refresh(store), on_progress)
+            # The store is only rewritten when a map changed, otherwise the data being served is already current
+            if refresh and saved_at is not None and store.saved_at() == saved_at:
+                return None
         mission_names = missions_df['Mission'].unique().tolist()
         
     
-        clusterer = MissionClusterer(mission_names)
-        clusterer.cluster_missions()
+        clusterer = MissionClusterer(mission_names, cache_dir=CLUSTERER_CACHE_DIR, emoji_seed=EMOJI_SEED, backend=CLUSTER_BACKEND)
+        with metrics.timer('stage.cluster_missions', missions=len(mission_names), backend=CLUSTER_BACKEND):
+            clusterer.cluster_missions()
         
         title_updater = MissionTitleUpdater(clusterer)
-        missions_df = title_updater.add_title_column(missions_df)
-        missions_df = title_updater.add_ai_prompts_column(missions_df)
+        with metrics.timer('stage.titles', records=len(missions_df)):
+            missions_df = title_updater.add_title_column(missions_df)
+        with metrics.timer('stage.shared_dataset'):
+            dataset = SharedDataset(missions_df, players_df)
+        with metrics.timer('stage.player_index'):
+            player_index = PlayerRecordIndex(dataset)
     
     
-        return missions_df, players_df
+        return dataset, player_index
     
     @staticmethod
-    def fetch_data():
-        return asyncio.run(DataFetcher.async_fetch_data())
+    def fetch_data(on_progress=None, refresh=False):
+        return asyncio.run(DataFetcher.async_fetch_data(on_progress, refresh))
+
+    @staticmethod
+    def build_snapshot_data(on_progress=None, refresh=True):
+        """
+        Fetches the dataset and derives everything sessions share from it, or returns None when nothing new was fetched.
+        """
+        data = DataFetcher.fetch_data(on_progress, refresh)
+        if data is None:
+            return None
+        dataset, player_index = data
+        if dataset.missions_df.empty or dataset.players_df.empty:
+            return None
+        with metrics.timer('stage.aggregates'):
+            aggregates = LeaderboardAggregates(dataset)
+        with metrics.timer('stage.search_index'):
+            search_indexes = build_search_indexes(dataset, aggregates)
+        players_df = dataset.players_df
+        player_labels = UtilityFunctions.player_labels(players_df)
+        # Identifies the card contents of this load, so cached cards are reused until a player's data changes
+        data_version = int(pd.util.hash_pandas_object(players_df[['SteamID', 'PersonaName', 'AvatarURL', 'WorldRecordsHeld']], index=False).sum())
+        return dataset, player_index, aggregates, search_indexes, player_labels, data_version
 
     @staticmethod
     @st.cache_resource
-    def get_data():
-        return DataFetcher.fetch_data()
+    def get_refresher():
+        """
+        Returns the process-wide DataRefresher. Its snapshots are built by a background thread that always refreshes
+        from the network, and sessions switch to a new one on their next rerun.
+        """
+        return DataRefresher(DataFetcher.build_snapshot_data, REFRESH_INTERVAL)
 
 class UtilityFunctions:
     @staticmethod
-    def parse_description(description_tag):
-        components = []
-        for element in description_tag.descendants:
-            if isinstance(element, NavigableString):
-                if element.strip() != '':
-                    components.append(element.strip())
-            elif isinstance(element, Tag):
-                if element.name == 'br':
-                    components.append('<br>')  # Change to HTML line break
-                elif element.name == 'img':
-                    # Keep the image tags as HTML and ensure they are displayed inline
-                    image_url = element.get('src')
-                    alt_text = element.get('alt', '')
-                    components.append(f'<img src="{image_url}" alt="{alt_text}" style="display: inline; height: auto; max-width: 100%;">')
-                elif element.name == 'a':
-                    # Convert to HTML anchor tag
-                    link_text = element.text
-                    link_url = element.get('href')
-                    components.append(f'<a href="{link_url}">{link_text}</a>')
-        return ''.join(components)  # Return as HTML string
+    def player_labels(players_df):
+        """
+        Maps each SteamID to the name shown in the player picker, adding the SteamID where display names collide.
+        """
+        names = players_df['PersonaName']
+        labels = names.where(~names.duplicated(keep=False), names + ' (' + players_df['SteamID'] + ')')
+        return dict(zip(players_df['SteamID'], labels))
 
     @staticmethod
-    def create_card_html(player, index):
-        background_url = player['BackgroundURL']
-        avatar_url = player['AvatarURL']
-        persona_name = player['PersonaName']
-        world_records_held = player['WorldRecordsHeld']
-        description = player['Description']
-
-        card_html = f"""
-        <body style="background: linear-gradient(to bottom, #3e1e28 0%, #2c202b 20%, #1e222f 100%);"> 
-        <div class="card-container" style="background-image: url('{background_url}');">
-            <div class="card">
-                <div class="flip-card-inner">
-                    <div class="flip-card-front">
-                        <img src="{avatar_url}" alt="{persona_name}">
-                        <div class="card-info">
-                            <h3>{persona_name}</h3>
-                            <p>Rank: #{index + 1}</p>
-                            <p>World Records: {world_records_held}</p>
-                        </div>
-                    </div>
-                    <div class="flip-card-back">
-                        <div class="card-back-content">
-                            <h1><style="box-shadow:  5px 5px 19px rgba(0,0,0,0.4), -5px -5px 19px rgba(0,0,0,0.4);">{persona_name}'s Details</h1>
-                            <p>{description}</p>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        </body>
-        <style>
-            .card-container {{
-                box-sizing: border-box;
-                perspective: 1000px;
-                width: calc(20% - 10px);
-                margin: 10px 5px 20px;
-                height: 330px;
-                border: 2px solid #f0f0f0;
-                border-radius: 10px;
-                background-size: cover;
-                background-position: center;
-                display: inline-block;
-                vertical-align: top;
-
-            }}
-
-            .card {{
-                width: 100%;
-                height: 100%;
-                position: relative;
-                transform-style: preserve-3d;
-                transition: transform 0.6s;
-
-
-            }}
-
-            .card:hover .flip-card-inner {{
-                transform: rotateY(180deg);
-            }}
-
-            .flip-card-front, .flip-card-back {{
-                position: absolute;
-                width: 100%;
-                height: 100%;
-                backface-visibility: hidden;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                flex-direction: column;
-                border-radius: 10px;
-                overflow: hidden;
-                box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-                background-color: rgba(255, 255, 255, 0.1);
-                backdrop-filter: blur(2px);
-            }}
-
-            .flip-card-front {{
-                background-size: cover;
-                background-position: center;
-            }}
-
-            .card-info {{
-                width: 100%;
-                color: #fff;
-                padding: 5px;
-                margin-bottom: 4px;
-                background-color: rgba(0, 0, 0, 0.1);
-                text-align: center;
-                border: 1px solid #f0f0f0;
-                box-shadow:  5px 5px 19px rgba(0,0,0,0.4),
-                 -5px -5px 19px rgba(0,0,0,0.4);
-            }}
-            .card-back-content {{
-                width: 100%;
-                color: #fff;
-                font-size: 10px;
-                overflow: auto;
-                padding: 5px;
-                margin-bottom: 8px;
-            }}
-
-            .flip-card-inner {{
-                position: relative;
-                width: 100%;
-                height: 100%;
-                text-align: center;
-                transition: transform 0.6s;
-                transform-style: preserve-3d;
-            }}
-            .flip-card-back {{
-                background-size: cover;
-                background-position: center;
-                transform: rotateY(180deg);
-            }}
-            .flip-card-front {{
-                z-index: 2; 
-            }}
-
-            .flip-card-back {{
-                transform: rotateY(180deg); 
-                z-index: 1;  
-            }}
-
-            .card-container:hover .flip-card-inner {{
-                transform: rotateY(180deg); 
-            }}
-
-            .flip-card-front img {{
-                width: auto;
-                height: auto;
-                max-width: 125px;
-                border-radius: 25%; 
-                margin-bottom: 17px;
-                box-shadow:  5px 5px 19px rgba(0,0,0,0.4),
-                 -5px -5px 19px rgba(0,0,0,0.4);
-            }}
-
-        </style>
+    def search_picker(label, search_index, format_func=str, key=None):
         """
+        Draws a search box and a picker over the top matches of what is typed in it, and returns the picked key.
 
-        return card_html
-
-    @staticmethod
-    def filter_by_player(df, player_name):
-        df = df.dropna(subset=['Players'])
-        df['Players'] = df['Players'].astype(str)
-        return df[df['Players'].str.contains(player_name, case=False)]
+        Only SEARCH_MATCHES options are sent to the browser however many entries the index holds. Returns None when
+        nothing matches.
+        """
+        query = st.text_input(f"Search {label}", key=f'{key}_query' if key else None, placeholder="Type a name and press Enter")
+        with metrics.timer('stage.search'):
+            matches = search_index.search(query, SEARCH_MATCHES)
+        if not matches:
+            st.info(f"No {label} match '{query}'.")
+            return None
+        return st.selectbox("Select one of the best matches", matches, format_func=format_func, key=key)
 
     @staticmethod
     def update_top_players(players_df, selection_count):
-        modified_df = players_df.copy()
-        modified_df['WorldRecordsHeld'] = pd.to_numeric(players_df['WorldRecordsHeld'], errors='coerce').fillna(0).astype(int)
-        modified_df['AvatarURL'] = modified_df['AvatarURL'].str.replace('_medium', '_full')
-        return modified_df.nlargest(selection_count, 'WorldRecordsHeld')
+        # nlargest already returns a new frame holding only the selected players, the shared frame is never written to
+        top_players_df = players_df.nlargest(selection_count, 'WorldRecordsHeld')
+        return top_players_df.assign(AvatarURL=top_players_df['AvatarURL'].str.replace('_medium', '_full'))
     
     @staticmethod
-    def search_and_display_by_date(df):
+    def search_and_display_by_date(date_index, dataset):
         with st.form("record_search_form"):
             st.subheader('Search and Display Records by Date')
             record_type = st.selectbox("Select the record type", ['All', 'World Record', 'Personal Best'], index=0).lower()
-            date_input = st.date_input("Select a date", datetime.today())
+            date_input = st.date_input("Select a date, or a start and end date", (datetime.today(),))
             submit_button = st.form_submit_button(label='Search')
 
             if submit_button:
-                search_date = pd.Timestamp(date_input)
-                if record_type != 'all':
-                    filtered_df = df[df['World Record'] == (record_type == "world record")].copy()
-                else:
-                    filtered_df = df.copy()
-            
-                filtered_df['Date'] = pd.to_datetime(filtered_df['Date'], format='%m/%d/%Y')
-                exact_date_found = search_date in filtered_df['Date'].values
-
-                if exact_date_found:
-                    display_df = filtered_df[filtered_df['Date'] == search_date]
+                if len(date_input) == 2:
+                    start_date, end_date = pd.Timestamp(date_input[0]), pd.Timestamp(date_input[1])
+                    display_df = date_index.records_between(record_type, start_date, end_date)
+                    if display_df.empty:
+                        st.warning(f"No data found between {format_date(start_date)} and {format_date(end_date)}.")
                 else:
-                    nearest_date = filtered_df.iloc[(filtered_df['Date'] - search_date).abs().argsort()[:1]]
-                    display_df = filtered_df[filtered_df['Date'] == nearest_date['Date'].values[0]]
-                    st.warning(f"No data found for {date_input.strftime('%m/%d/%Y')}. Showing results for the nearest date: {nearest_date['Date'].dt.strftime('%m/%d/%Y').values[0]}")
-                
-                for index, row in display_df.iterrows():
-                    st.markdown(f'```markdown\n{row["AI_Prompt"]}\n```') 
+                    search_date = pd.Timestamp(date_input[0]) if date_input else pd.Timestamp(datetime.today()).normalize()
+                    nearest_date = date_index.nearest_date(record_type, search_date)
+                    if nearest_date is None:
+                        st.warning("No data found for this player.")
+                        return
+                    display_df = date_index.records_on(record_type, nearest_date)
+                    if nearest_date != search_date:
+                        st.warning(f"No data found for {format_date(search_date)}. Showing results for the nearest date: {format_date(nearest_date)}")
+
+                if len(display_df) > RECORD_SEARCH_MAX_RESULTS:
+                    st.caption(f"Showing the first {RECORD_SEARCH_MAX_RESULTS} of {len(display_df)} records.")
+                    display_df = display_df.head(RECORD_SEARCH_MAX_RESULTS)
+                with metrics.timer('stage.prompts', records=len(display_df)):
+                    # Row labels of the shared missions frame are row positions, which is how records point at their players
+                    prompts = [MissionTitleUpdater.generate_prompt_for_self(row, dataset.player_names(row.name)) for _, row in display_df.iterrows()]
+                for prompt in prompts:
+                    st.markdown(f'```markdown\n{prompt}\n```') 
 
     @staticmethod
-    def display_cards(players_df, player_count_selection):
-        all_cards_html = "<div style='display: flex; flex-wrap: wrap; justify-content: center;'>"
-
-        # Fetch descriptions and background URLs for unique ProfileURLs
-        unique_urls = players_df['ProfileURL'].unique()
-        description_cache = {url: DataFetcher.fetch_description(url) for url in unique_urls}
-        background_cache = {url: DataFetcher.fetch_background_url(url) for url in unique_urls}
-
-        # Modify the players_df DataFrame using vectorized operations
-        players_df['Description'] = players_df['ProfileURL'].map(description_cache)
-        players_df['BackgroundURL'] = players_df['ProfileURL'].map(background_cache)
+    def display_cards(players_df, first_rank, data_version):
+        """
+        Renders one page of player cards, ranked from first_rank, as a single document carrying the stylesheet once.
+        """
+        # Fetch descriptions and background URLs for the unique ProfileURLs of this page only
+        profiles = DataFetcher.fetch_profiles(players_df['ProfileURL'].unique())
 
-        cards_html = [UtilityFunctions.create_card_html(player, index) for index, player in players_df.iterrows()]
-        all_cards_html += ''.join(cards_html)
-        all_cards_html += "</div>"
+        cards_html = [
+            render_card(data_version, steam_id, rank, persona_name, avatar_url, int(world_records_held), *profiles[profile_url])
+            for rank, (steam_id, persona_name, avatar_url, world_records_held, profile_url) in enumerate(
+                zip(players_df['SteamID'], players_df['PersonaName'], players_df['AvatarURL'], players_df['WorldRecordsHeld'], players_df['ProfileURL']),
+                start=first_rank)
+        ]
+        st.components.v1.html(render_page(cards_html), height=page_height(len(cards_html)))
 
-        # Pre-set values
-        card_height = 340  # The height of a single card
-        card_margin = 20   # The total vertical margin around a card
-        cards_per_row = 5  # Number of cards in a single row
+    @staticmethod
+    def display_rankings(aggregates, search_indexes):
+        scope = st.radio("Rank players", LEADERBOARD_SCOPES, index=0, horizontal=True)
+        if scope == 'Map':
+            value = UtilityFunctions.search_picker("maps", search_indexes['map'], key='rankings_map')
+        else:
+            value = 'All' if scope == 'All' else st.selectbox(f"Select a {scope.lower()}", aggregates.scope_values(scope))
+        if value is None:
+            return
+        order = st.radio("Rank by", list(LEADERBOARD_ORDERS), index=0, horizontal=True)
+        top_players_df = aggregates.top_players(scope, value, order, LEADERBOARD_SIZE)
+        st.dataframe(top_players_df.rename(columns={'WorldRecords': 'World Records', 'PersonalBests': 'Personal Bests'}), hide_index=True, use_container_width=True)
 
-        rows = (player_count_selection / cards_per_row)
+    @staticmethod
+    def display_progression(aggregates, dataset, search_indexes):
+        mission_key = UtilityFunctions.search_picker("missions", search_indexes['mission'], key='progression_mission')
+        if mission_key is None:
+            return
+        progression_df = aggregates.mission_progression(mission_key)
+        records_df = dataset.missions_df.iloc[progression_df['RecordRow'].to_numpy()]
+        st.line_chart(pd.DataFrame({'Best time (minutes)': progression_df['TimeSeconds'].to_numpy() / 60},
+                                   index=pd.to_datetime(progression_df['TimeAdded'].to_numpy(), unit='s')))
+        st.dataframe(pd.DataFrame({
+            'Date': records_df['Date'].map(format_date).to_numpy(),
+            'Difficulty': records_df['Difficulty'].to_numpy(),
+            'Time': format_time_column(progression_df['TimeSeconds']).to_numpy(),
+            # The first record of a mission has nothing to improve on
+            'Improvement': format_time_column(progression_df['Improvement']).where(progression_df['Improvement'] > 0, '').to_numpy(),
+            'Players': [', '.join(dataset.player_names(record_row)) for record_row in progression_df['RecordRow']],
+        }), hide_index=True, use_container_width=True)
 
-        # Calculate total height of the container based on rows, card height, and margins
-        total_height = rows * (card_height + card_margin)
+    @staticmethod
+    def display_teammates(aggregates, dataset, player_index, search_indexes, player_labels):
+        names = dataset.players_df['PersonaName'].to_numpy()
+        st.subheader("Most frequent teammates")
+        pairs_df = aggregates.top_pairs(LEADERBOARD_SIZE)
+        st.dataframe(pd.DataFrame({
+            'Player': names[pairs_df['PlayerKey'].to_numpy()],
+            'Teammate': names[pairs_df['TeammateKey'].to_numpy()],
+            'Runs together': pairs_df['Runs'].to_numpy(),
+            'World Records together': pairs_df['WorldRecords'].to_numpy(),
+        }), hide_index=True, use_container_width=True)
+
+        st.subheader("Teammates of a player")
+        selected_steam_id = UtilityFunctions.search_picker("players", search_indexes['player'], player_labels.get, key='teammates_player')
+        if selected_steam_id is None:
+            return
+        teammates_df = aggregates.top_teammates(player_index.player_keys.get_loc(selected_steam_id), LEADERBOARD_SIZE)
+        st.dataframe(pd.DataFrame({
+            'Teammate': names[teammates_df['TeammateKey'].to_numpy()],
+            'Runs together': teammates_df['Runs'].to_numpy(),
+            'World Records together': teammates_df['WorldRecords'].to_numpy(),
+        }), hide_index=True, use_container_width=True)
 
-        st.components.v1.html(all_cards_html, height=total_height)
+    @staticmethod
+    def display_diagnostics():
+        snapshot = metrics.snapshot()
+        st.caption("Process-wide since startup: timings are in seconds, percentiles are histogram bucket bounds.")
+        if snapshot['histograms']:
+            timings_df = pd.DataFrame.from_dict(snapshot['histograms'], orient='index').drop(columns='buckets')
+            st.dataframe(timings_df, use_container_width=True)
+
+        cache_stats = DataFetcher.get_profile_cache().stats
+        lookups = cache_stats['hits'] + cache_stats['disk_hits'] + cache_stats['misses']
+        counters = dict(snapshot['counters'])
+        counters.update({f'profile_cache.{name}': value for name, value in cache_stats.items()})
+        counters['profile_cache.hit_rate'] = round((cache_stats['hits'] + cache_stats['disk_hits']) / lookups, 3) if lookups else None
+        st.dataframe(pd.Series(counters, name='value'), use_container_width=True)
+
+        st.json({**snapshot, 'profile_cache': cache_stats}, expanded=False)
 
     @staticmethod
     def display_system_prompt():
@@ -389,6 +341,43 @@ Review the annoucement to ensure it is concise, and witty, maximizing the Humor
     '''
         st.markdown(f"```markdown\n{system_prompt}\n```")
 
+class ProgressiveView:
+    """
+    Placeholders for the record search and player dashboard that fill in with partial data while maps are loading.
+
+    Partial results are shown read-only: titles, prompts and profile cards need the full dataset and are rendered
+    by the regular sections once loading has finished.
+    """
+    def __init__(self):
+        self.placeholder = st.empty()
+        with self.placeholder.container():
+            with st.expander("Record Search (loading)", expanded=True):
+                self.record_search_status = st.empty()
+                self.record_search = st.empty()
+            with st.expander("Player Dashboard (loading)", expanded=True):
+                self.dashboard_status = st.empty()
+                self.dashboard = st.empty()
+
+    def update(self, missions_df, players_df, maps_loaded):
+        if missions_df.empty:
+            return
+        latest_df = missions_df.nlargest(50, 'TimeAdded')
+        self.record_search_status.caption(f"Latest records from the {maps_loaded} maps loaded so far")
+        self.record_search.dataframe(pd.DataFrame({
+            'Date': latest_df['Date'].map(format_date),
+            'Map': latest_df['Map'],
+            'Mission': latest_df['Mission'],
+            'Difficulty': latest_df['Difficulty'],
+            'Time': latest_df['TimeSeconds'].map(format_time),
+            'World Record': latest_df['World Record'],
+            'Players': latest_df['Players'].map(', '.join),
+        }), hide_index=True, use_container_width=True)
+        self.dashboard_status.caption(f"Top players among the {len(players_df)} seen so far")
+        self.dashboard.dataframe(players_df.nlargest(10, 'WorldRecordsHeld')[['PersonaName', 'WorldRecordsHeld']], hide_index=True, use_container_width=True)
+
+    def clear(self):
+        self.placeholder.empty()
+
 class MainApp:
     def __init__(self):
         self.missions_df = None
@@ -406,21 +395,31 @@ class MainApp:
         st.title("Shroomer Shill Station 300k")
         st.markdown("### A tool for searching and displaying records for the [Potato.tf](https://potato.tf/speedrun) MvM speedrunning community")
         st.markdown("#### Created by [Chessmaster Hex](https://github.com/Leafyleafy33) and [Mushroom hunting](https://www.youtube.com/@Mushroomhunting1337) for peak laziness")
-        # Data fetching and storing in session state
-        if 'data_fetched' not in st.session_state:
-            missions_df, players_df = DataFetcher.get_data()
-            if missions_df.empty or players_df.empty:
-                st.error("Failed to fetch data. Please check data sources and network connectivity.")
-                return
-            st.session_state['missions_df'] = missions_df
-            st.session_state['players_df'] = players_df
-            st.session_state['data_fetched'] = True
+        # Data fetching
+        refresher = DataFetcher.get_refresher()
+        # Read once per rerun, so the whole page is drawn from the same snapshot even if a refresh publishes meanwhile
+        snapshot = refresher.current
+        if snapshot is None:
+            # The first load serves a recent stored snapshot as is, the background refreshes take over from there
+            if PROGRESSIVE_LOADING:
+                progressive_view = ProgressiveView()
+                snapshot = refresher.load(progressive_view.update, False)
+                progressive_view.clear()
+            else:
+                snapshot = refresher.load(None, False)
+        if snapshot is None:
+            st.error("Failed to fetch data. Please check data sources and network connectivity.")
+            return
+        # Every session reads the same read-only snapshot by reference, nothing per session is copied into session_state
+        dataset, player_index, aggregates, search_indexes, player_labels, data_version = snapshot.data
+        st.caption(f"Data version {snapshot.version}, updated {datetime.fromtimestamp(snapshot.built_at).strftime('%Y-%m-%d %H:%M')}")
 
         # Record Search Section
         with st.expander("Record Search"):
-            selected_player_name = st.selectbox("Select a player", st.session_state['players_df']['PersonaName'])
-            player_missions = UtilityFunctions.filter_by_player(st.session_state['missions_df'], selected_player_name)
-            UtilityFunctions.search_and_display_by_date(player_missions)
+            # Searched through an index built with the snapshot, so only the best matches are sent, not every player
+            selected_steam_id = UtilityFunctions.search_picker("players", search_indexes['player'], player_labels.get, key='record_search_player')
+            if selected_steam_id is not None:
+                UtilityFunctions.search_and_display_by_date(player_index.date_index(selected_steam_id), dataset)
 
         # button to show system prompt
         with st.expander("System Prompt"):
@@ -429,12 +428,32 @@ class MainApp:
 
         # Player Dashboard Section
         with st.expander("Player Dashboard"):
-            player_count_options = ['10', '20', '50']
-            player_count_selection = st.radio("Select the number of top players to display:", player_count_options, index=0)
-            top_players_df = UtilityFunctions.update_top_players(st.session_state['players_df'], int(player_count_selection))
-            
-            # Call the display_cards function with the DataFrame of top players
-            UtilityFunctions.display_cards(top_players_df, int(player_count_selection))
+            player_count_options = ['10', '20', '50', '200', '500']
+            player_count_selection = st.radio("Select the number of top players to display:", player_count_options, index=0, horizontal=True)
+            top_players_df = UtilityFunctions.update_top_players(dataset.players_df, int(player_count_selection))
+
+            # Large selections are paged so that only one page of profiles is scraped and rendered per rerun
+            page_count = -(-len(top_players_df) // CARDS_PER_PAGE)
+            page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1) if page_count > 1 else 1
+            first_index = (page - 1) * CARDS_PER_PAGE
+
+            # Call the display_cards function with the page of top players
+            UtilityFunctions.display_cards(top_players_df.iloc[first_index:first_index + CARDS_PER_PAGE], first_index + 1, data_version)
+
+        # Leaderboards Section, read from tables aggregated once per data version
+        with st.expander("Leaderboards"):
+            rankings_tab, progression_tab, teammates_tab = st.tabs(["Rankings", "World Record Progression", "Teammates"])
+            with rankings_tab:
+                UtilityFunctions.display_rankings(aggregates, search_indexes)
+            with progression_tab:
+                UtilityFunctions.display_progression(aggregates, dataset, search_indexes)
+            with teammates_tab:
+                UtilityFunctions.display_teammates(aggregates, dataset, player_index, search_indexes, player_labels)
+
+        # Diagnostics Section, only shown when the instrumentation is switched on with SHILL_METRICS=1
+        if metrics.enabled:
+            with st.expander("Diagnostics"):
+                UtilityFunctions.display_diagnostics()
 
 if __name__ == '__main__':
     st.set_page_config(page_title="MvM Shill Station", page_icon="🍄", layout="wide", initial_sidebar_state="expanded")
@@ -0,0 +1,111 @@
+import json
+import os
+import time
+import pandas as pd
+
+SNAPSHOT_VERSION = 3
+
+class SnapshotStore:
+    """
+    A columnar on-disk snapshot of the data produced by MissionDataExtractor.
+
+    The snapshot lets a restarted process pick up the last crawl straight from disk, and lets a refresh reprocess only
+    the maps whose listing changed since the previous crawl. It is made of three Parquet tables and a small metadata file:
+    - records.parquet: the raw speedrun records of every map, trimmed to the fields process_data reads.
+    - missions.parquet / players.parquet: the per-map output of process_data, tagged with the map it came from.
+    - meta.json: the snapshot version, when its records were last written (saved_at) and last confirmed current by a
+      refresh (checked_at), the newest timeAdded (watermark) seen for each map and the HTTP validators (ETag,
+      Last-Modified and payload hash) of each map's last /api/speedrun response.
+
+    Attributes:
+        path (str): The directory holding the snapshot files.
+    """
+    RECORD_COLUMNS = ['map', 'mission', 'time', 'timeAdded', 'players']
+    PLAYER_FIELDS = ['steamid', 'personaname', 'profileurl', 'avatarmedium']
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def load_meta(self):
+        try:
+            with open(self._file('meta.json')) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('version') == SNAPSHOT_VERSION else None
+
+    def exists(self):
+        return self.load_meta() is not None
+
+    def saved_at(self):
+        meta = self.load_meta()
+        return meta['saved_at'] if meta else None
+
+    def age(self):
+        """
+        Seconds since a refresh last wrote or confirmed the snapshot, or infinity when there is no usable snapshot.
+        """
+        meta = self.load_meta()
+        return time.time() - meta.get('checked_at', meta['saved_at']) if meta else float('inf')
+
+    def load(self):
+        """
+        Returns the stored records, missions and players frames along with the per-map watermarks.
+        Empty frames and watermarks are returned when no usable snapshot exists.
+        """
+        meta = self.load_meta()
+        if meta is None:
+            return pd.DataFrame(columns=self.RECORD_COLUMNS), pd.DataFrame(), pd.DataFrame(), {}
+
+        records_df = pd.read_parquet(self._file('records.parquet'))
+        missions_df = pd.read_parquet(self._file('missions.parquet'))
+        players_df = pd.read_parquet(self._file('players.parquet'))
+        return records_df, missions_df, players_df, meta['watermarks']
+
+    def load_validators(self):
+        meta = self.load_meta()
+        return meta.get('validators', {}) if meta else {}
+
+    def to_records_frame(self, speedrun_data, map_name):
+        """
+        Converts the raw /api/speedrun records of one map into the columnar layout stored in records.parquet, null
+        fields taking the same defaults as missing ones.
+        """
+        rows = [{
+            'map': map_name,
+            'mission': record.get('mission') or '',
+            'time': record.get('time') or 0,
+            'timeAdded': record.get('timeAdded') or 0,
+            'players': [{field: player.get(field) or '' for field in self.PLAYER_FIELDS} for player in record.get('players') or []],
+        } for record in speedrun_data]
+        return pd.DataFrame(rows, columns=self.RECORD_COLUMNS)
+
+    def save(self, records_df, missions_df, players_df, validators=None):
+        os.makedirs(self.path, exist_ok=True)
+        # Write each table to a temporary file first so a crash mid-save never leaves a half-written Parquet file behind
+        for name, df in (('records.parquet', records_df), ('missions.parquet', missions_df), ('players.parquet', players_df)):
+            tmp_path = self._file(name + '.tmp')
+            df.reset_index(drop=True).to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self._file(name))
+
+        watermarks = records_df.groupby('map')['timeAdded'].max().astype(int).to_dict() if not records_df.empty else {}
+        saved_at = time.time()
+        self.save_meta({'version': SNAPSHOT_VERSION, 'saved_at': saved_at, 'checked_at': saved_at, 'watermarks': watermarks,
+                        'validators': validators or {}})
+
+    def mark_checked(self, validators):
+        """
+        Records a refresh that found no record to change: checked_at and the validators move, saved_at is kept.
+        """
+        meta = self.load_meta()
+        if meta is not None:
+            self.save_meta(dict(meta, checked_at=time.time(), validators=validators))
+
+    def save_meta(self, meta):
+        tmp_path = self._file('meta.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._file('meta.json'))
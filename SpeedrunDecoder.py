@@ -0,0 +1,42 @@
+from typing import List, Union
+
+try:
+    import msgspec
+except ImportError:  # Optional, payloads are decoded with json.loads into dicts without it
+    msgspec = None
+
+if msgspec is not None:
+    class SpeedrunPlayer(msgspec.Struct):
+        """
+        The fields of a record's player that the app reads. Every other field of the Steam player summary is skipped
+        while decoding instead of being built into a dict entry. A field may be null, which readers treat as missing.
+        """
+        steamid: Union[str, None] = ''
+        personaname: Union[str, None] = ''
+        profileurl: Union[str, None] = ''
+        avatarmedium: Union[str, None] = ''
+
+    class SpeedrunRecord(msgspec.Struct):
+        """
+        The fields of an /api/speedrun record that the app reads.
+        """
+        mission: Union[str, None] = ''
+        time: Union[int, float, None] = 0
+        timeAdded: Union[int, float, None] = 0
+        players: Union[List[SpeedrunPlayer], None] = []
+
+    SPEEDRUN_DECODER = msgspec.json.Decoder(List[SpeedrunRecord])
+
+def decode_speedrun_records(body):
+    """
+    Decodes a raw /api/speedrun body into a list of SpeedrunRecord structs, reading only the fields the app uses.
+
+    Returns None when msgspec is not installed or the body does not match the schema (or is not valid JSON), so that
+    the caller falls back to decoding it generically, with the same results and errors as before.
+    """
+    if msgspec is None:
+        return None
+    try:
+        return SPEEDRUN_DECODER.decode(body)
+    except msgspec.DecodeError:
+        return None
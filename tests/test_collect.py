@@ -0,0 +1,28 @@
+import asyncio
+import pandas as pd
+from MissionDataExtractor import MissionDataExtractor
+
+def map_frames(count):
+    async def generate():
+        for index in range(count):
+            missions_df = pd.DataFrame({'Map': [f'map_{index}'], 'Mission': ['a'], 'TimeSeconds': [index]})
+            players_df = pd.DataFrame({'SteamID': [str(index)], 'WorldRecord': [True], 'PersonaName': ['p'], 'ProfileURL': [''], 'AvatarURL': ['']})
+            yield f'map_{index}', missions_df, players_df
+    return generate()
+
+def collect(count, progress_interval):
+    calls = []
+    extractor = MissionDataExtractor()
+    missions_df, players_df = asyncio.run(extractor.collect(
+        map_frames(count), lambda missions_df, players_df, maps_loaded: calls.append(maps_loaded), progress_interval))
+    return missions_df, players_df, calls
+
+def test_collect_combines_every_map():
+    missions_df, players_df, _ = collect(5, 0)
+    assert len(missions_df) == 5
+    assert len(players_df) == 5
+
+def test_progress_is_throttled():
+    assert collect(5, 0)[2] == [1, 2, 3, 4, 5]
+    # The first map is shown straight away, the rest wait for the interval or the final result
+    assert collect(5, 3600)[2] == [1]
@@ -0,0 +1,43 @@
+import threading
+import time
+from DataRefresher import DataRefresher
+
+Thread = threading.Thread
+
+class SlowThread(Thread):
+    """
+    Widens the gap between checking for a running background thread and recording the new one.
+    """
+    started = []
+
+    def __init__(self, *args, **kwargs):
+        time.sleep(0.05)
+        super().__init__(*args, **kwargs)
+        SlowThread.started.append(self)
+
+def test_concurrent_loads_start_one_thread(monkeypatch):
+    monkeypatch.setattr('DataRefresher.threading.Thread', SlowThread)
+    monkeypatch.setattr(SlowThread, 'started', [])
+    builds = []
+    refresher = DataRefresher(lambda: builds.append(1) or len(builds), interval=3600)
+    barrier = threading.Barrier(8)
+
+    def load():
+        barrier.wait()
+        refresher.load()
+    sessions = [Thread(target=load) for _ in range(8)]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    try:
+        assert len(builds) == 1
+        assert len(SlowThread.started) == 1
+        assert refresher.current.version == 1
+    finally:
+        refresher.stop()
+
+def test_no_thread_without_an_interval():
+    refresher = DataRefresher(lambda: 'data', interval=0)
+    assert refresher.load().data == 'data'
+    assert refresher.thread is None
@@ -0,0 +1,18 @@
+import time
+from datetime import datetime
+import pytest
+from MissionDataExtractor import local_dates
+
+@pytest.fixture(params=['UTC', 'America/New_York', 'Asia/Tokyo'])
+def timezone(request, monkeypatch):
+    monkeypatch.setenv('TZ', request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+def test_local_dates_match_fromtimestamp(timezone):
+    # Around midnight UTC, and on both sides of a daylight saving change
+    timestamps = [1609459200 - 3600, 1609459200 + 3600, 1615705200, 1615705200 + 86400, 1615705200, 0]
+    expected = [datetime.fromtimestamp(timestamp).date() for timestamp in timestamps]
+    assert [date.date() for date in local_dates(timestamps)] == expected
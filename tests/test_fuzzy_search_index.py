@@ -0,0 +1,41 @@
+from FuzzySearchIndex import FuzzySearchIndex
+
+def player_index(count=200):
+    return FuzzySearchIndex([(str(number), f'Player {number}') for number in range(count)])
+
+def test_whole_word_match_comes_first():
+    assert player_index().search('player 12', limit=5)[0] == '12'
+    assert player_index().search('Player 12', limit=5)[0] == '12'
+
+def test_prefix_matches_longer_entries():
+    results = player_index().search('player 12', limit=20)
+    assert {'12', '120', '121', '129'} <= set(results)
+
+def test_typo_still_matches():
+    index = FuzzySearchIndex([('1', 'Mannhattan'), ('2', 'Rottenburg'), ('3', 'Decoy')])
+    assert index.search('manhatan')[0] == '1'
+    assert index.search('rottenberg')[0] == '2'
+
+def test_out_of_order_words():
+    index = FuzzySearchIndex([('a', 'Doom 6 | Desert Escalation'), ('b', 'Parts 2 | Escalation Broken')])
+    assert index.search('escalation desert')[0] == 'a'
+
+def test_substring_match_is_preferred():
+    index = FuzzySearchIndex([('a', 'Coal Town'), ('b', 'Coaltown Cloaked'), ('c', 'Coal Pit')])
+    assert index.search('coaltown')[0] == 'b'
+
+def test_empty_query_returns_the_first_entries():
+    assert player_index().search('', limit=3) == ['0', '1', '2']
+    assert player_index().search('   ', limit=3) == ['0', '1', '2']
+
+def test_no_match():
+    assert player_index().search('zzz') == []
+    assert FuzzySearchIndex([]).search('player') == []
+
+def test_limit():
+    assert len(player_index().search('player', limit=7)) == 7
+    assert len(player_index(3).search('player', limit=7)) == 3
+
+def test_ties_keep_entry_order():
+    index = FuzzySearchIndex([('b', 'Decoy'), ('a', 'Decoy')])
+    assert index.search('decoy') == ['b', 'a']
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from PlayerRecordIndex import PlayerRecordIndex
+from RecordDateIndex import RecordDateIndex
+from SharedDataset import SharedDataset
+
+def build_dataset():
+    missions_df = pd.DataFrame({
+        'Mission': ['a', 'b', 'c', 'd', 'e'],
+        'Date': pd.to_datetime(['2023-01-10', '2023-01-01', '2023-01-05', '2023-01-05', '2023-01-20']),
+        'World Record': [True, False, True, False, False],
+        'SteamIDs': [['1'], ['1', '2'], ['2'], ['1'], ['2']],
+    })
+    players_df = pd.DataFrame({'SteamID': ['1', '2', '3'], 'PersonaName': ['one', 'two', 'three']})
+    return SharedDataset(missions_df, players_df)
+
+@pytest.fixture
+def dataset():
+    return build_dataset()
+
+def test_nearest_date(dataset):
+    index = RecordDateIndex(dataset.missions_df)
+    assert index.nearest_date('all', pd.Timestamp('2023-01-05')) == pd.Timestamp('2023-01-05')
+    assert index.nearest_date('all', pd.Timestamp('2023-01-08')) == pd.Timestamp('2023-01-10')
+    assert index.nearest_date('all', pd.Timestamp('2022-06-01')) == pd.Timestamp('2023-01-01')
+    assert index.nearest_date('all', pd.Timestamp('2024-01-01')) == pd.Timestamp('2023-01-20')
+    # Equally far from the 5th and the 10th
+    assert index.nearest_date('all', pd.Timestamp('2023-01-07 12:00')) == pd.Timestamp('2023-01-05')
+
+def test_records_between_is_inclusive_and_date_ordered(dataset):
+    index = RecordDateIndex(dataset.missions_df)
+    records = index.records_between('all', pd.Timestamp('2023-01-01'), pd.Timestamp('2023-01-10'))
+    assert records['Mission'].tolist() == ['b', 'c', 'd', 'a']
+    assert index.records_between('all', pd.Timestamp('2023-01-11'), pd.Timestamp('2023-01-19')).empty
+
+def test_records_on_by_record_type(dataset):
+    index = RecordDateIndex(dataset.missions_df)
+    day = pd.Timestamp('2023-01-05')
+    assert index.records_on('all', day)['Mission'].tolist() == ['c', 'd']
+    assert index.records_on('world record', day)['Mission'].tolist() == ['c']
+    assert index.records_on('personal best', day)['Mission'].tolist() == ['d']
+    assert index.nearest_date('world record', pd.Timestamp('2023-01-20')) == pd.Timestamp('2023-01-10')
+
+def test_empty_partition(dataset):
+    index = RecordDateIndex(dataset.missions_df, [1, 4])
+    assert index.nearest_date('world record', pd.Timestamp('2023-01-01')) is None
+    assert index.records_between('world record', pd.Timestamp('2023-01-01'), pd.Timestamp('2023-12-31')).empty
+
+def test_player_date_indexes_are_built_with_the_index(dataset):
+    player_index = PlayerRecordIndex(dataset)
+    assert set(player_index.date_indexes) == {0, 1}
+    date_index = player_index.date_index('1')
+    assert date_index is player_index.date_indexes[0]
+    assert date_index.records_between('all', pd.Timestamp('2023-01-01'), pd.Timestamp('2023-12-31'))['Mission'].tolist() == ['b', 'd', 'a']
+    assert player_index.date_index('2').records_on('world record', pd.Timestamp('2023-01-05'))['Mission'].tolist() == ['c']
+
+def test_unknown_player_has_no_records(dataset):
+    player_index = PlayerRecordIndex(dataset)
+    for steam_id in ['3', 'missing']:
+        assert player_index.date_index(steam_id).nearest_date('all', pd.Timestamp('2023-01-01')) is None
+        assert player_index.records_for_player(steam_id).empty
+    assert len(player_index.date_indexes) == 2
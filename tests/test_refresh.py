@@ -0,0 +1,152 @@
+import asyncio
+import pytest
+from FakePotatoServer import FakePotatoServer
+from MissionDataExtractor import MissionDataExtractor
+from SharedDataset import SharedDataset
+from SnapshotStore import SnapshotStore
+
+MAPS = 3
+RECORDS_PER_MAP = 20
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path))
+
+def refresh_with(server, store, changes=()):
+    """
+    Runs one refresh of store against server after applying each change, a function of the server, and returns the
+    combined missions and players frames.
+    """
+    async def run():
+        base_url = await server.start()
+        try:
+            for change in changes:
+                change(server)
+            extractor = MissionDataExtractor(base_url=base_url)
+            return await extractor.collect(extractor.refresh(store))
+        finally:
+            await server.stop()
+    return asyncio.run(run())
+
+def first_map(server):
+    return server.map_info[0]['name']
+
+def stored_records(store, map_name):
+    records_df = store.load()[0]
+    return records_df[records_df['map'] == map_name]
+
+def test_cold_refresh_stores_every_map(store):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    missions_df, players_df = refresh_with(server, store)
+    assert len(missions_df) == MAPS * RECORDS_PER_MAP
+    assert len(store.load()[0]) == MAPS * RECORDS_PER_MAP
+    assert set(store.load_validators()) == {item['name'] for item in server.map_info}
+    assert not players_df.empty
+
+def test_unchanged_refresh_keeps_the_snapshot(store):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    refresh_with(server, store)
+    saved_at = store.saved_at()
+    checked_at = store.load_meta()['checked_at']
+    missions_df, _ = refresh_with(server, store)
+    assert store.saved_at() == saved_at
+    # Confirmed current, so a restart serves it instead of crawling again
+    assert store.load_meta()['checked_at'] > checked_at
+    assert len(missions_df) == MAPS * RECORDS_PER_MAP
+
+def test_failed_refresh_does_not_confirm_the_snapshot(store):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    refresh_with(server, store)
+    checked_at = store.load_meta()['checked_at']
+    missions_df, _ = refresh_with(FakePotatoServer(latency=0, failure_rate=1.0, maps=MAPS, records_per_map=RECORDS_PER_MAP), store)
+    assert store.load_meta()['checked_at'] == checked_at
+    assert len(missions_df) == MAPS * RECORDS_PER_MAP
+
+def test_deleted_and_edited_records_leave_the_snapshot(store):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    refresh_with(server, store)
+    map_name = first_map(server)
+
+    def delete_and_edit(server):
+        records = server.speedruns[map_name]
+        del records[0]
+        # An older run corrected upstream, which no timeAdded watermark would pick up
+        records[0] = dict(records[0], time=1)
+
+    missions_df, _ = refresh_with(server, store, [delete_and_edit])
+    map_records_df = stored_records(store, map_name)
+    assert len(map_records_df) == RECORDS_PER_MAP - 1
+    assert 1 in map_records_df['time'].tolist()
+    assert len(missions_df) == MAPS * RECORDS_PER_MAP - 1
+    assert missions_df['TimeSeconds'].eq(1).sum() == 1
+
+def test_runs_sharing_mission_time_and_date_are_both_kept(store):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    refresh_with(server, store)
+    map_name = first_map(server)
+    template = server.speedruns[map_name][0]
+    other_players = [dict(player, steamid=player['steamid'] + '0') for player in template['players']]
+
+    def add_twin_runs(server):
+        latest = max(record['timeAdded'] for record in server.speedruns[map_name])
+        server.speedruns[map_name].append(dict(template, timeAdded=latest + 1))
+        server.speedruns[map_name].append(dict(template, timeAdded=latest + 1, players=other_players))
+
+    refresh_with(server, store, [add_twin_runs])
+    assert len(stored_records(store, map_name)) == RECORDS_PER_MAP + 2
+
+def test_map_emptied_upstream_leaves_the_snapshot(store):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    refresh_with(server, store)
+    map_name = first_map(server)
+    missions_df, _ = refresh_with(server, store, [lambda server: server.speedruns[map_name].clear()])
+    assert stored_records(store, map_name).empty
+    assert len(missions_df) == (MAPS - 1) * RECORDS_PER_MAP
+
+def test_validator_is_only_stored_once_the_map_is_reconciled(store, monkeypatch):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    refresh_with(server, store)
+    map_name = first_map(server)
+    validator = store.load_validators()[map_name]
+
+    def edit(server):
+        records = server.speedruns[map_name]
+        records[0] = dict(records[0], time=1)
+
+    def fail_on_first_map(self, map_records_df, processed_map_name):
+        if processed_map_name == map_name:
+            raise ValueError('processing failed')
+        return process_records_frame(self, map_records_df, processed_map_name)
+
+    process_records_frame = MissionDataExtractor.process_records_frame
+    with monkeypatch.context() as patch:
+        patch.setattr(MissionDataExtractor, 'process_records_frame', fail_on_first_map)
+        missions_df, _ = refresh_with(server, store, [edit])
+    # The stored records are still served, and the old validator makes the next refresh download the map again
+    assert store.load_validators()[map_name] == validator
+    assert 1 not in stored_records(store, map_name)['time'].tolist()
+    assert len(missions_df) == MAPS * RECORDS_PER_MAP
+
+    refresh_with(server, store)
+    assert store.load_validators()[map_name] != validator
+    assert 1 in stored_records(store, map_name)['time'].tolist()
+
+def test_shared_dataset_leaves_out_map_keys(store):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    missions_df, players_df = refresh_with(server, store)
+    assert 'MapKey' in missions_df
+    dataset = SharedDataset(missions_df, players_df)
+    assert 'MapKey' not in dataset.missions_df
+    assert 'MapKey' not in dataset.players_df
+    assert len(dataset.missions_df) == MAPS * RECORDS_PER_MAP
+
+def test_refresh_stores_null_fields_as_defaults(store):
+    server = FakePotatoServer(latency=0, maps=MAPS, records_per_map=RECORDS_PER_MAP)
+    record = server.speedruns[first_map(server)][0]
+    record.update(mission=None, time=None)
+    record['players'][0]['personaname'] = None
+    missions_df, _ = refresh_with(server, store)
+    assert len(missions_df) == MAPS * RECORDS_PER_MAP
+    records_df = stored_records(store, first_map(server))
+    assert (records_df['mission'] == '').sum() == 1
+    assert records_df['time'].dtype.kind == 'i'
@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+import aiohttp
+from FakePotatoServer import FakePotatoServer
+from Metrics import Metrics
+from MissionDataExtractor import MissionDataExtractor, is_retryable, parse_retry_after, wait_retry_after
+
+def response_error(status, retry_after=None):
+    return aiohttp.ClientResponseError(None, (), status=status, headers={'Retry-After': retry_after} if retry_after else {})
+
+def retry_state(exception, attempt_number=1):
+    return SimpleNamespace(outcome=SimpleNamespace(exception=lambda: exception), attempt_number=attempt_number)
+
+def test_parse_retry_after():
+    assert parse_retry_after({'Retry-After': '12'}) == 12
+    assert parse_retry_after({'Retry-After': 'Thu, 01 Jan 1970 00:00:00 GMT'}) == 0
+    assert parse_retry_after({'Retry-After': 'soon'}) is None
+    assert parse_retry_after(None) is None
+
+def test_retry_after_is_never_cut_short():
+    wait = wait_retry_after(lambda retry_state: 2, jitter=0.5)
+    for _ in range(20):
+        assert 45 <= wait(retry_state(response_error(429, '45'))) <= 45.5
+
+def test_backoff_wins_over_a_shorter_retry_after():
+    wait = wait_retry_after(lambda retry_state: 8, jitter=0.5)
+    assert 8 <= wait(retry_state(response_error(429, '1'))) <= 8.5
+    assert wait(retry_state(response_error(503))) == 8
+
+def test_retry_after_beyond_max_wait_gives_up():
+    assert is_retryable(response_error(429, '10'), max_wait=30)
+    assert not is_retryable(response_error(429, '120'), max_wait=30)
+    assert is_retryable(response_error(503))
+    assert not is_retryable(response_error(404))
+
+def fetch_statuses(server, monkeypatch):
+    """
+    Fetches /api/mapinfo once from server with metrics on, returning the request_seconds histogram and logged statuses.
+    """
+    registry = Metrics(enabled=True)
+    monkeypatch.setattr('MissionDataExtractor.metrics', registry)
+    logged = []
+    monkeypatch.setattr(registry, 'log', lambda event, **fields: logged.append(fields['status']))
+    registry.log_json = True
+
+    async def fetch():
+        base_url = await server.start()
+        try:
+            extractor = MissionDataExtractor(base_url=base_url, max_attempts=1)
+            async with extractor.create_session() as session:
+                await extractor.fetch_raw(session, f'{base_url}/api/mapinfo')
+        finally:
+            await server.stop()
+    try:
+        asyncio.run(fetch())
+    except aiohttp.ClientResponseError:
+        pass
+    return registry.snapshot()['histograms']['http.request_seconds'], logged
+
+def test_failed_responses_are_timed(monkeypatch):
+    histogram, statuses = fetch_statuses(FakePotatoServer(latency=0, failure_rate=1.0, maps=1), monkeypatch)
+    assert histogram['count'] == 1
+    assert statuses == [503]
+
+def test_successful_responses_are_timed(monkeypatch):
+    histogram, statuses = fetch_statuses(FakePotatoServer(latency=0, maps=1), monkeypatch)
+    assert histogram['count'] == 1
+    assert statuses == [200]
@@ -0,0 +1,66 @@
+import json
+import pandas as pd
+from SnapshotStore import SnapshotStore, SNAPSHOT_VERSION
+
+def record(mission, time, time_added, *steam_ids):
+    return {'mission': mission, 'time': time, 'timeAdded': time_added,
+            'players': [{'steamid': steam_id, 'personaname': f'Player {steam_id}', 'profileurl': '', 'avatarmedium': ''} for steam_id in steam_ids]}
+
+def test_load_without_snapshot_is_empty(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    records_df, missions_df, players_df, watermarks = store.load()
+    assert not store.exists()
+    assert store.age() == float('inf')
+    assert records_df.empty and missions_df.empty and players_df.empty
+    assert watermarks == {}
+
+def test_save_and_load_round_trip(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    records_df = pd.concat([
+        store.to_records_frame([record('adv_a', 600, 100, '1'), record('adv_a', 700, 300, '1', '2')], 'mvm_one'),
+        store.to_records_frame([record('exp_b', 900, 200, '3')], 'mvm_two'),
+    ], ignore_index=True)
+    missions_df = pd.DataFrame({'Mission': ['A', 'A', 'B'], 'TimeSeconds': [600, 700, 900], 'MapKey': ['mvm_one', 'mvm_one', 'mvm_two']})
+    players_df = pd.DataFrame({'SteamID': ['1', '1', '2', '3'], 'MapKey': ['mvm_one', 'mvm_one', 'mvm_one', 'mvm_two']})
+    validators = {'mvm_one': {'etag': '"a"', 'last_modified': None, 'hash': 'h1'}}
+    store.save(records_df, missions_df, players_df, validators)
+
+    loaded_records_df, loaded_missions_df, loaded_players_df, watermarks = store.load()
+    assert store.exists()
+    assert store.age() < 60
+    pd.testing.assert_frame_equal(loaded_missions_df, missions_df)
+    pd.testing.assert_frame_equal(loaded_players_df, players_df)
+    assert loaded_records_df['players'].map(len).tolist() == [1, 2, 1]
+    assert store.load_validators() == validators
+
+def test_watermarks_are_the_newest_time_added_per_map(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    records_df = pd.concat([
+        store.to_records_frame([record('adv_a', 600, 100, '1'), record('adv_a', 700, 300, '1')], 'mvm_one'),
+        store.to_records_frame([record('exp_b', 900, 200, '3')], 'mvm_two'),
+    ], ignore_index=True)
+    store.save(records_df, pd.DataFrame({'MapKey': []}), pd.DataFrame({'MapKey': []}))
+    assert store.load()[3] == {'mvm_one': 300, 'mvm_two': 200}
+
+def test_snapshot_of_another_version_is_ignored(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save(store.to_records_frame([record('adv_a', 600, 100, '1')], 'mvm_one'), pd.DataFrame({'MapKey': []}), pd.DataFrame({'MapKey': []}))
+    meta_path = tmp_path / 'meta.json'
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps(dict(meta, version=SNAPSHOT_VERSION - 1)))
+    assert not store.exists()
+    assert store.load()[0].empty
+
+def test_mark_checked_keeps_saved_at_and_resets_age(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save(store.to_records_frame([record('adv_a', 600, 100, '1')], 'mvm_one'), pd.DataFrame({'MapKey': []}), pd.DataFrame({'MapKey': []}))
+    meta_path = tmp_path / 'meta.json'
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps(dict(meta, saved_at=meta['saved_at'] - 7200, checked_at=meta['checked_at'] - 7200)))
+    saved_at = store.saved_at()
+    assert store.age() > 3600
+
+    store.mark_checked({'mvm_one': {'etag': '"b"', 'last_modified': None, 'hash': 'h2'}})
+    assert store.saved_at() == saved_at
+    assert store.age() < 60
+    assert store.load_validators()['mvm_one']['etag'] == '"b"'
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import pytest
+import SpeedrunDecoder
+from FakePotatoServer import FakePotatoServer
+from MissionDataExtractor import MissionDataExtractor
+from SpeedrunDecoder import decode_speedrun_records
+
+needs_msgspec = pytest.mark.skipif(SpeedrunDecoder.msgspec is None, reason='msgspec is not installed')
+
+RECORDS = [
+    {'mission': 'mvm_test_adv_alpha', 'time': 1200, 'timeAdded': 1700000000, 'players': [
+        {'steamid': '1', 'personaname': 'one', 'profileurl': 'https://p/1', 'avatarmedium': 'https://a/1_medium.jpg',
+         'avatarhash': 'ignored'},
+        {'steamid': '2', 'personaname': 'two', 'profileurl': 'https://p/2', 'avatarmedium': 'https://a/2_medium.jpg'},
+    ]},
+    {'mission': 'mvm_test_int_beta', 'time': 900, 'timeAdded': 1700086400, 'players': [
+        {'steamid': '2', 'personaname': 'two', 'profileurl': 'https://p/2', 'avatarmedium': 'https://a/2_medium.jpg'},
+    ]},
+]
+NULL_RECORDS = [
+    {'mission': None, 'time': None, 'timeAdded': None, 'players': [
+        {'steamid': None, 'personaname': None, 'profileurl': None, 'avatarmedium': None},
+    ]},
+    {'mission': 'mvm_test_adv_alpha', 'time': 1200, 'timeAdded': 1700000000, 'players': None},
+]
+MISSING_RECORDS = [
+    {'players': [{}]},
+    {'mission': 'mvm_test_adv_alpha', 'time': 1200, 'timeAdded': 1700000000},
+]
+
+@pytest.fixture
+def extractor():
+    return MissionDataExtractor()
+
+def generic_columns(extractor, records):
+    return extractor.build_record_columns(json.loads(json.dumps(records)))
+
+@needs_msgspec
+@pytest.mark.parametrize('records', [RECORDS, NULL_RECORDS, MISSING_RECORDS])
+def test_struct_columns_match_generic_columns(extractor, records):
+    body = json.dumps(records).encode()
+    assert decode_speedrun_records(body) is not None
+    assert extractor.decode_record_columns(body) == generic_columns(extractor, records)
+
+@pytest.mark.parametrize('records', [NULL_RECORDS, MISSING_RECORDS])
+def test_null_and_missing_fields_take_defaults(extractor, records):
+    record_columns, player_columns = extractor.decode_record_columns(json.dumps(records).encode())
+    assert record_columns['RawMission'] == ['', 'mvm_test_adv_alpha']
+    assert record_columns['TimeSeconds'] == [0, 1200]
+    assert record_columns['Players'] == [[''], []]
+    assert record_columns['SteamIDs'] == [[''], []]
+    assert player_columns['ProfileURL'] == ['']
+    assert player_columns['AvatarURL'] == ['']
+
+@pytest.mark.parametrize('records', [NULL_RECORDS, MISSING_RECORDS])
+def test_null_fields_are_processed(extractor, records):
+    missions_df, players_df = extractor.decode_and_process(json.dumps(records).encode(), 'mvm_test')
+    assert missions_df['TimeSeconds'].tolist() == [0, 1200]
+    assert players_df['PersonaName'].tolist() == ['']
+
+def test_without_msgspec_the_body_is_decoded_generically(extractor, monkeypatch):
+    body = json.dumps(NULL_RECORDS).encode()
+    monkeypatch.setattr(SpeedrunDecoder, 'msgspec', None)
+    assert decode_speedrun_records(body) is None
+    assert extractor.decode_record_columns(body) == generic_columns(extractor, NULL_RECORDS)
+
+@needs_msgspec
+def test_schema_mismatch_falls_back(extractor):
+    records = [dict(RECORDS[0], time='1200')]
+    body = json.dumps(records).encode()
+    assert decode_speedrun_records(body) is None
+    assert extractor.decode_record_columns(body) == generic_columns(extractor, records)
+
+def test_empty_and_invalid_bodies(extractor):
+    assert extractor.decode_record_columns(b'[]') is None
+    with pytest.raises(ValueError):
+        extractor.decode_record_columns(b'{not json')
+
+def test_a_bad_map_only_skips_itself():
+    server = FakePotatoServer(latency=0, maps=3, records_per_map=10)
+    null_map, bad_map, good_map = [item['name'] for item in server.map_info]
+    server.speedruns[null_map][0].update(mission=None, time=None)
+    server.speedruns[null_map][0]['players'][0]['personaname'] = None
+    # A record that is not an object at all cannot be turned into columns on either path
+    server.speedruns[bad_map].append('not a record')
+
+    async def crawl():
+        base_url = await server.start()
+        try:
+            extractor = MissionDataExtractor(base_url=base_url)
+            return await extractor.collect(extractor.run())
+        finally:
+            await server.stop()
+    missions_df, _ = asyncio.run(crawl())
+    assert missions_df.groupby('Map').size().to_dict() == {
+        MissionDataExtractor().adjust_map_name(null_map).replace('_', ' '): 10,
+        MissionDataExtractor().adjust_map_name(good_map).replace('_', ' '): 10,
+    }